@@ -1,25 +1,61 @@
+import os
 import time
+from urllib.parse import quote
+
+from dotenv import load_dotenv
+
+from readiness import wait_for
+
+# Load environment variables from .env file
+load_dotenv()
 
-# Wait for 5 seconds before importing Flask and other modules
-time.sleep(5)
+# Wait until PostgreSQL accepts connections before importing the models,
+# which bind a database engine at import time
+wait_for(os.getenv('POSTGRES_HOST'), int(os.getenv('POSTGRES_PORT')))
 
-from flask import jsonify
+
+from flask import jsonify, make_response
 from flask import render_template, request
+from sqlalchemy import text, tuple_
 from models import (
     app,
+    db,
+    ReadSession,
     AppPersonalInformation,
+    AppPersonalInformationThumbnail,
     AppLanguageInformation,
     AppNationalityInformation,
     AppPictureInformation,
     AppChangeAppLogInformation,
     AppLogInformation,
-    AppArrestWarrantInformation
+    AppArrestWarrantInformation,
+    AppCounterInformation
 )
-import os
-from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()
+# One round-trip for the details page: PostgreSQL aggregates every child table
+# into JSON arrays server-side, so no per-table query or ORM hydration is needed
+PERSON_DETAILS_SQL = text("""
+    SELECT row_to_json(p.*) AS person,
+           (SELECT json_agg(l.*) FROM language_informations l WHERE l.entity_id = p.entity_id) AS languages,
+           (SELECT json_agg(n.*) FROM nationality_informations n WHERE n.entity_id = p.entity_id) AS nationalities,
+           (SELECT json_agg(a.*) FROM arrest_warrant_informations a WHERE a.entity_id = p.entity_id) AS arrest_warrants,
+           (SELECT json_agg(pi.*) FROM picture_informations pi WHERE pi.entity_id = p.entity_id) AS pictures,
+           (SELECT json_agg(c.*) FROM change_log c WHERE c.entity_id = p.entity_id) AS change_log,
+           (SELECT json_agg(lg.*) FROM log lg WHERE lg.entity_id = p.entity_id) AS log
+    FROM personal_informations p
+    WHERE p.entity_id = :entity_id
+""")
+
+# Cheap freshness probe for the details page ETag; hits the entity_id indexes
+# on change_log and log. The log table is included because child-row
+# additions and deletions (pictures, warrants, languages, nationalities) only
+# write there, and the page renders them all
+PERSON_LAST_CHANGE_SQL = text("""
+    SELECT greatest(
+        (SELECT max(change_date) FROM change_log WHERE entity_id = :entity_id),
+        (SELECT max(timestamp) FROM log WHERE entity_id = :entity_id)
+    )
+""")
 
 class Application:
     def __init__(self, app):
@@ -36,53 +72,144 @@ class Application:
         self.app.route('/details/<path:entity_id>')(self.person_details)
         self.app.route('/check_new_data')(self.check_new_data)
 
+        # Return the read session's connection to its pool after each request
+        self.app.teardown_appcontext(lambda exception=None: ReadSession.remove())
+
+        # Number of persons rendered per results page
+        self.per_page = 5
+
         # Initialize counters as instance attributes
         self.counter_added = 0
         self.counter_deleted = 0
         self.counter_changed = 0
 
+        # Cache the COUNT queries behind a short TTL so many concurrent pollers
+        # hit the database at most once per TTL window
+        self._count_cache = {}
+        self._count_ttl = float(os.getenv('CHECK_NEW_DATA_TTL', '1.0'))
+
+        # Cache rendered results pages keyed by (cursor, freshness token); any
+        # consumer write changes the token and implicitly invalidates the cache
+        self._results_cache = {}
+
     def run(self):
-        self.app.run(host=self.host, port=self.port)
+        # Serve through gunicorn with gevent workers instead of the
+        # single-threaded Werkzeug development server; the endpoints are
+        # I/O-bound so greenlet workers handle many requests concurrently.
+        # execvp replaces the current process with the gunicorn master.
+        os.execvp('gunicorn', [
+            'gunicorn',
+            '-k', 'gevent',
+            '-w', os.getenv('GUNICORN_WORKERS', '4'),
+            '--worker-connections', os.getenv('GUNICORN_WORKER_CONNECTIONS', '200'),
+            '-b', f'{self.host}:{self.port}',
+            'app:app'
+        ])
 
     def results(self):
         """
         Handles the results route and paginates the returned person data.
         """
-        # Get the page number from the URL query parameter, or use 1 as default
-        page = request.args.get('page', 1, type=int)
-        # Query the database for the list of persons and paginate the results
-        persons_query = AppPersonalInformation.query.order_by(AppPersonalInformation.name).paginate(page=page, per_page=5)
-        persons = persons_query.items
-        pages = range(1, persons_query.pages + 1)
-        # Generate URLs for next and previous pages
-        next_url = f'/results?page={persons_query.next_num}' if persons_query.has_next else None
-        prev_url = f'/results?page={persons_query.prev_num}' if persons_query.has_prev else None
+        # Keyset pagination: the 'after' cursor holds the (name, entity_id) of the
+        # last row on the previous page, so no COUNT(*) or OFFSET scan is needed
+        # and only the columns the listing renders are fetched
+        after = request.args.get('after')
+        # Serve the cached HTML when this page was already rendered for the
+        # current state of the data
+        cache_key = (after, sum(self._counters().values()))
+        cached_page = self._results_cache.get(cache_key)
+        if cached_page is not None:
+            return cached_page
+        # The listing is the only query that needs thumbnails, so it joins the
+        # side table explicitly; every other person query stays narrow
+        query = ReadSession.query(AppPersonalInformation).with_entities(
+            AppPersonalInformation.entity_id,
+            AppPersonalInformation.forename,
+            AppPersonalInformation.name,
+            AppPersonalInformationThumbnail.thumbnail
+        ).outerjoin(
+            AppPersonalInformationThumbnail,
+            AppPersonalInformationThumbnail.entity_id == AppPersonalInformation.entity_id
+        ).order_by(AppPersonalInformation.name, AppPersonalInformation.entity_id)
+        if after:
+            last_name, _, last_id = after.rpartition('|')
+            query = query.filter(
+                tuple_(AppPersonalInformation.name, AppPersonalInformation.entity_id) > (last_name, last_id))
+        # Fetch one extra row to know whether a next page exists
+        persons = query.limit(self.per_page + 1).all()
+        has_next = len(persons) > self.per_page
+        persons = persons[:self.per_page]
+        # Generate the URL for the next page from the last row of this one
+        next_url = None
+        if has_next:
+            last = persons[-1]
+            next_url = f"/results?after={quote(f'{last.name}|{last.entity_id}')}"
         # Render the HTML template with the list of persons and pagination information
-        return render_template('results.html', persons=persons, pagination=persons_query, pages=pages, next_url=next_url, prev_url=prev_url)
+        page = render_template('results.html', persons=persons, next_url=next_url)
+        # Drop stale entries (older tokens) before caching the fresh render
+        if len(self._results_cache) > 100:
+            self._results_cache.clear()
+        self._results_cache[cache_key] = page
+        return page
 
     def person_details(self, entity_id):
         """
         Handles the details route, retrieving person and related information based on a given entity_id.
         """
-        # Query the database for the AppPersonalInformation record based on entity_id
-        person = AppPersonalInformation.query.get(entity_id)
-        # Query the database for related information based on entity_id
-        language_info = AppLanguageInformation.query.filter_by(entity_id=entity_id).all()
-        nationality_info = AppNationalityInformation.query.filter_by(entity_id=entity_id).all()
-        arrest_warrant_info = AppArrestWarrantInformation.query.filter_by(entity_id=entity_id).all()
-        picture_info = AppPictureInformation.query.filter_by(entity_id=entity_id).all()
-        change_log_info = AppChangeAppLogInformation.query.filter_by(entity_id=entity_id).all()
-        log_info = AppLogInformation.query.filter_by(entity_id=entity_id).all()
+        # Derive a validator from the entity's latest change so unchanged pages
+        # are answered with 304 Not Modified before any query or render work
+        last_change = ReadSession.execute(PERSON_LAST_CHANGE_SQL, {'entity_id': entity_id}).scalar()
+        etag = f'{entity_id}-{last_change.timestamp():.0f}' if last_change else f'{entity_id}-0'
+        if request.if_none_match.contains(etag):
+            return '', 304
+
+        # One SQL round-trip returns the person row and every child collection
+        # as server-side JSON aggregates; the dicts go straight to the template
+        row = ReadSession.execute(PERSON_DETAILS_SQL, {'entity_id': entity_id}).mappings().first()
+        person = row['person'] if row else None
+        language_info = (row['languages'] or []) if row else []
+        nationality_info = (row['nationalities'] or []) if row else []
+        arrest_warrant_info = (row['arrest_warrants'] or []) if row else []
+        picture_info = (row['pictures'] or []) if row else []
+        change_log_info = (row['change_log'] or []) if row else []
+        log_info = (row['log'] or []) if row else []
         # Render the HTML template with the person details and related information
-        return render_template('details.html', person=person, language_info=language_info, nationality_info=nationality_info, arrest_warrant_info=arrest_warrant_info, picture_info=picture_info, change_log_info=change_log_info, log_info=log_info)
+        response = make_response(render_template('details.html', person=person, language_info=language_info, nationality_info=nationality_info, arrest_warrant_info=arrest_warrant_info, picture_info=picture_info, change_log_info=change_log_info, log_info=log_info))
+        # Let the browser revalidate with If-None-Match instead of refetching
+        response.set_etag(etag)
+        response.cache_control.private = True
+        response.cache_control.max_age = 60
+        return response
+
+    def _cached_count(self, name, compute):
+        """
+        Returns a cached count for the given name, recomputing it through the
+        provided callable only when the cached value is older than the TTL.
+        """
+        now = time.monotonic()
+        cached = self._count_cache.get(name)
+        if cached is None or now - cached[1] >= self._count_ttl:
+            cached = (compute(), now)
+            self._count_cache[name] = cached
+        return cached[0]
+
+    def _counters(self):
+        """
+        Returns the running counters maintained by the consumer at insert time,
+        cached behind the short TTL.
+        """
+        return self._cached_count(
+            'counters', lambda: {row.name: row.value for row in ReadSession.query(AppCounterInformation).all()})
 
     def check_new_data(self):
         """
          Checks if there is new data added, deleted or changed since the last check.
         """
-        new_data_added = AppLogInformation.query.filter_by(action='Added').count()
-        new_data_deleted = AppLogInformation.query.filter_by(action='Deleted').count()
-        new_data_changed = AppChangeAppLogInformation.query.count()
+        # Read the running counters instead of recounting the log tables
+        counters = self._counters()
+        new_data_added = counters.get('added', 0)
+        new_data_deleted = counters.get('deleted', 0)
+        new_data_changed = counters.get('changed', 0)
 
         has_new_data_added = new_data_added > self.counter_added
         has_new_data_deleted = new_data_deleted > self.counter_deleted
@@ -98,7 +225,10 @@ class Application:
             'has_new_data_changed': has_new_data_changed
         })
 
+# Instantiate at import time so the routes are registered both when gunicorn
+# workers import app:app and when application() is run from consumer.py
+app_flask = Application(app)
+
 def application():
-    app_flask = Application(app)
     app_flask.run()
 
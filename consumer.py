@@ -1,24 +1,93 @@
-import json
-import time
+import heapq
+import os
+import threading
+
+from dotenv import load_dotenv
+
+from readiness import wait_for
+
+# Load environment variables from .env file
+load_dotenv()
+
+# Wait until PostgreSQL and RabbitMQ actually accept connections instead of
+# sleeping for a fixed number of seconds
+wait_for(os.getenv('POSTGRES_HOST'), int(os.getenv('POSTGRES_PORT')))
+wait_for(os.getenv('RABBITMQ_HOST'), 5672)
 
 # Import the create_tables function from database_creation module
 from database_creation import create_tables
 
-time.sleep(2)
 create_tables()
+import orjson
 import pika
+import zstandard as zstd
+from concurrent.futures import ThreadPoolExecutor
 from multiprocessing import Process
 from app import application
 from database_operations import DatabaseOperationsCallback
-import os
-from dotenv import load_dotenv
-
-# Load environment variables from .env file
-load_dotenv()
 
 # Retrieve RabbitMQ host from environment variable
 rabbitmq_host = os.getenv('RABBITMQ_HOST')
 
+# Shared zstd decompressor for the compressed JSON bodies the producer
+# publishes with content_encoding='zstd'
+_DECOMPRESSOR = zstd.ZstdDecompressor()
+
+
+def _decode_body(properties, body):
+    """
+    Returns the plain message body, decompressing it first when the producer
+    marked it as zstd-compressed.
+    """
+    if properties.content_encoding == 'zstd':
+        return _DECOMPRESSOR.decompress(body)
+    return body
+
+
+class BatchAckTracker:
+    """
+    Tracks settled delivery tags for a channel when messages finish out of
+    order, and acknowledges contiguous runs of successfully processed
+    messages in batches.
+
+    Attributes:
+        channel (pika.channel.Channel): The channel the tags belong to.
+        batch (int): How many acknowledgements to accumulate before flushing.
+    """
+    def __init__(self, channel, batch):
+        self.channel = channel
+        self.batch = batch
+        self._completed = []  # heap of (delivery_tag, success) pairs
+        self._frontier = 0  # every tag up to and including this one is settled
+        self._ack_candidate = None  # highest acknowledgeable tag within the frontier
+        self._pending = 0
+
+    def settle(self, delivery_tag, success):
+        """
+        Records the outcome for a delivery tag. Failed messages are already
+        nacked individually by the caller; successful ones are acknowledged
+        with multiple=True once a contiguous batch has accumulated.
+        """
+        heapq.heappush(self._completed, (delivery_tag, success))
+        # Advance the frontier over the contiguous run of settled tags
+        while self._completed and self._completed[0][0] == self._frontier + 1:
+            tag, ok = heapq.heappop(self._completed)
+            self._frontier = tag
+            if ok:
+                self._ack_candidate = tag
+                self._pending += 1
+        if self._pending >= self.batch:
+            self.flush()
+
+    def flush(self):
+        """
+        Acknowledges the accumulated batch of successfully processed messages.
+        """
+        if self._pending:
+            self.channel.basic_ack(delivery_tag=self._ack_candidate, multiple=True)
+            self._pending = 0
+
+
 # Define a class to consume messages from a RabbitMQ queue
 class RabbitMQConsumer:
     """
@@ -33,17 +102,54 @@ class RabbitMQConsumer:
         The constructor for RabbitMQConsumer class. It initializes connection and channel to the RabbitMQ server,
         and declares the queues to consume messages from.
         """
-        # Create a connection to the local RabbitMQ server
-        self.connection = pika.BlockingConnection(pika.ConnectionParameters(host=rabbitmq_host))
-        self.channel = self.connection.channel()
+        # Create a connection to the local RabbitMQ server with an explicit
+        # heartbeat so long database writes do not drop the connection
+        params = pika.ConnectionParameters(host=rabbitmq_host, heartbeat=30, blocked_connection_timeout=300)
+        self.connection = pika.BlockingConnection(params)
+
+        # One channel per queue so a slow callback on one queue cannot block
+        # deliveries on the other, each with its own bounded prefetch window
+        # so a backlog cannot grow the client buffer without bound
+        prefetch = int(os.getenv('RABBITMQ_PREFETCH', '100'))
+        self.add_channel = self.connection.channel()
+        self.add_channel.basic_qos(prefetch_count=prefetch)
+        self.change_channel = self.connection.channel()
+        self.change_channel.basic_qos(prefetch_count=prefetch)
+        self.images_channel = self.connection.channel()
+        self.images_channel.basic_qos(prefetch_count=prefetch)
+
+        # Acknowledge messages in batches (one basic_ack with multiple=True per
+        # ACK_BATCH messages) instead of one network frame per message
+        ack_batch = int(os.getenv('ACK_BATCH', '50'))
+        self._add_tracker = BatchAckTracker(self.add_channel, ack_batch)
+        self._change_tracker = BatchAckTracker(self.change_channel, ack_batch)
+        self._images_tracker = BatchAckTracker(self.images_channel, ack_batch)
+
+        # Run the database work on a bounded pool of worker threads so several
+        # messages can wait on Postgres concurrently; the prefetch window caps
+        # how many messages are in flight at once
+        self._executor = ThreadPoolExecutor(max_workers=int(os.getenv('CONSUMER_WORKERS', '8')))
+
+        # Each worker thread gets its own DatabaseOperationsCallback, since
+        # SQLAlchemy sessions are not safe to share across threads
+        self._local = threading.local()
 
-        # Declare queues to consume messages from
-        self.channel.queue_declare(queue='add_data')
-        self.channel.queue_declare(queue='change_data')
+        # Failed images (usually an image racing ahead of the person row it
+        # references) are redelivered after a delay and dropped after a
+        # bounded number of attempts, instead of hot-looping against Postgres
+        self._image_attempts = {}
+        self._image_retry_limit = int(os.getenv('IMAGE_RETRY_LIMIT', '5'))
+        self._image_retry_delay = float(os.getenv('IMAGE_RETRY_DELAY', '5'))
+
+        # Buffer add_data messages so a whole window is inserted and committed
+        # as one transaction instead of one commit per message
+        self._add_buffer = []
+        self._insert_batch = int(os.getenv('INSERT_BATCH', '25'))
 
         # Set up consumers to consume messages from the queue and call the callback function for each message
-        self.channel.basic_consume(queue='add_data', on_message_callback=self.callback, auto_ack=True)
-        self.channel.basic_consume(queue='change_data', on_message_callback=self.callback_change, auto_ack=True)
+        self.add_channel.basic_consume(queue='add_data', on_message_callback=self.callback, auto_ack=False)
+        self.change_channel.basic_consume(queue='change_data', on_message_callback=self.callback_change, auto_ack=False)
+        self.images_channel.basic_consume(queue='images', on_message_callback=self.callback_images, auto_ack=False)
 
     # Define callback functions to be called for each message consumed from the queue
     def callback_change(self, ch, method, properties, body):
@@ -58,14 +164,16 @@ class RabbitMQConsumer:
             properties (pika.spec.BasicProperties): The properties.
             body (bytes): The body of the message containing the data for a certain 'entity_id'.
         """
-        # Print the message received from the queue
-        data = json.loads(body.decode('utf-8'))
+        # Print the message received from the queue; orjson parses the raw
+        # bytes directly, skipping the intermediate UTF-8 decode
+        body = _decode_body(properties, body)
+        data = orjson.loads(body)
         entity_id = data['entity_id']
         print(f"A record of {entity_id} entity id has been received.")
 
-        # Process the message body by passing it to the DatabaseOperationsCallback class
-        operator = DatabaseOperationsCallback()
-        operator.callback_change_db(body)
+        # Hand the database work to a worker thread; the message is settled
+        # on the connection's thread once the work has finished
+        self._executor.submit(self._process, 'callback_change_db', body, method.delivery_tag)
 
     def callback(self, ch, method, properties, body):
         """
@@ -81,25 +189,191 @@ class RabbitMQConsumer:
             properties (pika.spec.BasicProperties): The properties.
             body (bytes): The body of the message containing the data for a certain 'entity_id'.
         """
-        # Print the message received from the queue
-        data = json.loads(body.decode('utf-8'))
+        # Print the message received from the queue; orjson parses the raw
+        # bytes directly, skipping the intermediate UTF-8 decode
+        body = _decode_body(properties, body)
+        data = orjson.loads(body)
         entity_id = data['entity_id']
         print(f"A record of {entity_id} entity id has been received.")
 
-        # Process the message body by passing it to the DatabaseOperationsCallback class
-        operator = DatabaseOperationsCallback()
-        operator.callback_db(body)
+        # Buffer the message; the batch is inserted in one transaction once it
+        # is full (or when the periodic flush fires)
+        self._add_buffer.append((body, method.delivery_tag))
+        if len(self._add_buffer) >= self._insert_batch:
+            self._flush_add_buffer()
+
+    def callback_images(self, ch, method, properties, body):
+        """
+        The callback function to be executed when a message is received from the 'images' queue.
+        The body carries the raw image bytes and the message headers identify
+        the picture row the image belongs to.
+
+        Parameters:
+            ch (pika.channel.Channel): The channel object.
+            method (pika.spec.Basic.Deliver): The method frame.
+            properties (pika.spec.BasicProperties): The properties carrying the picture headers.
+            body (bytes): The raw image bytes.
+        """
+        self._executor.submit(self._process_image, body, properties.headers or {}, method.delivery_tag)
+
+    def _process_image(self, body, headers, delivery_tag):
+        """
+        Upserts one raw image into its picture row on a worker thread. Images
+        can arrive before the personal information row they reference, so a
+        failure is requeued instead of dropped.
+
+        Parameters:
+            body (bytes): The raw image bytes.
+            headers (dict): The picture metadata from the message headers.
+            delivery_tag (int): The delivery tag to settle when done.
+        """
+        picture_id = headers.get('picture_id')
+        try:
+            self._get_operator().callback_image_db(body, headers)
+        except Exception as error:
+            attempts = self._image_attempts.get(picture_id, 0) + 1
+            self._image_attempts[picture_id] = attempts
+            if attempts >= self._image_retry_limit:
+                # The person row is evidently never coming; drop the image
+                # instead of requeueing it forever
+                print(f"Giving up on the image for picture {picture_id} after {attempts} attempts: {error}")
+                self._image_attempts.pop(picture_id, None)
+                self.connection.add_callback_threadsafe(
+                    lambda: self._settle(self.images_channel, self._images_tracker, delivery_tag, False))
+            else:
+                # Hold the unacked message for a moment before nacking so the
+                # broker's redelivery is not an immediate tight loop
+                print(f"Processing of an image for picture {picture_id} failed (attempt {attempts}): {error}")
+                self.connection.add_callback_threadsafe(
+                    lambda: self.connection.call_later(
+                        self._image_retry_delay,
+                        lambda: self._settle(
+                            self.images_channel, self._images_tracker, delivery_tag, False, requeue=True)))
+        else:
+            self._image_attempts.pop(picture_id, None)
+            self.connection.add_callback_threadsafe(
+                lambda: self._settle(self.images_channel, self._images_tracker, delivery_tag, True))
+
+    def _flush_add_buffer(self):
+        """
+        Hands the buffered add_data messages to a worker thread, which inserts
+        and commits them as a single batch.
+        """
+        if not self._add_buffer:
+            return
+        batch = self._add_buffer
+        self._add_buffer = []
+        self._executor.submit(self._process_batch, batch)
+
+    def _process_batch(self, batch):
+        """
+        Inserts a batch of add_data messages in one transaction on a worker
+        thread, then settles all of their delivery tags together.
+
+        Parameters:
+            batch (list): (body, delivery_tag) pairs to process.
+        """
+        try:
+            self._get_operator().callback_db_many([body for body, _ in batch])
+        except Exception as error:
+            print(f"Processing of an add_data batch of {len(batch)} messages failed: {error}")
+            # Leave the worker's session usable for the next batch
+            self._get_operator().discard_failed_transaction()
+            success = False
+        else:
+            success = True
+        for _, delivery_tag in batch:
+            self.connection.add_callback_threadsafe(
+                lambda tag=delivery_tag: self._settle(self.add_channel, self._add_tracker, tag, success))
+
+    def _get_operator(self):
+        """
+        Returns the DatabaseOperationsCallback belonging to the current worker
+        thread, creating it on first use.
+        """
+        operator = getattr(self._local, 'operator', None)
+        if operator is None:
+            operator = DatabaseOperationsCallback()
+            self._local.operator = operator
+        return operator
+
+    def _process(self, handler, body, delivery_tag):
+        """
+        Runs the named DatabaseOperationsCallback handler on a worker thread
+        and schedules the acknowledgement back onto the connection's thread.
+
+        Parameters:
+            handler (str): Name of the operator method to invoke.
+            body (bytes): The raw message body.
+            delivery_tag (int): The delivery tag to settle when done.
+        """
+        try:
+            getattr(self._get_operator(), handler)(body)
+        except Exception as error:
+            print(f"Processing of delivery {delivery_tag} failed: {error}")
+            # Leave the worker's session usable for the next message
+            self._get_operator().discard_failed_transaction()
+            self.connection.add_callback_threadsafe(
+                lambda: self._settle(self.change_channel, self._change_tracker, delivery_tag, False))
+        else:
+            self.connection.add_callback_threadsafe(
+                lambda: self._settle(self.change_channel, self._change_tracker, delivery_tag, True))
+
+    def _settle(self, channel, tracker, delivery_tag, success, requeue=False):
+        """
+        Settles a delivery on the connection's thread: failures are nacked
+        individually, successes are batched through the channel's ack tracker.
+        """
+        if not success:
+            channel.basic_nack(delivery_tag=delivery_tag, requeue=requeue)
+        tracker.settle(delivery_tag, success)
+
+    def _flush_acks(self):
+        """
+        Acknowledges any partially filled batch so that messages do not stay
+        unacknowledged while the queue is idle. Reschedules itself every second.
+        """
+        self._add_tracker.flush()
+        self._change_tracker.flush()
+        self._images_tracker.flush()
+        self.connection.call_later(1.0, self._flush_acks)
+
+    def _flush_inserts(self):
+        """
+        Flushes a partially filled add_data buffer so messages are not held
+        back while the queue is quiet. Reschedules itself every half second.
+        """
+        self._flush_add_buffer()
+        self.connection.call_later(0.5, self._flush_inserts)
 
     def start_consuming(self):
-        # Start consuming messages from the queue
+        # Start consuming messages from the queues; the connection-level event
+        # loop dispatches deliveries, timers and heartbeats for both channels
         print(' [*] Waiting for messages. To exit press CTRL+C')
-        self.channel.start_consuming()
+        self.connection.call_later(1.0, self._flush_acks)
+        self.connection.call_later(0.5, self._flush_inserts)
+        while True:
+            self.connection.process_data_events(time_limit=1)
 
     def close(self):
         # Close the RabbitMQ connection
         self.connection.close()
 
 
+def setup_topology():
+    """
+    Declares the durable queue topology exactly once at boot, before the
+    consumer and web server processes fork, so queues survive broker restarts
+    and consumers no longer redeclare them on every start.
+    """
+    connection = pika.BlockingConnection(pika.ConnectionParameters(host=rabbitmq_host))
+    channel = connection.channel()
+    channel.queue_declare(queue='add_data', durable=True)
+    channel.queue_declare(queue='change_data', durable=True)
+    channel.queue_declare(queue='images', durable=True)
+    connection.close()
+
+
 # Define a consumer function that initializes and starts a RabbitMQ consumer
 def consumer():
     """
@@ -112,7 +386,9 @@ def consumer():
 # Check if the current script is being run as the main entry point
 if __name__ == "__main__":
 
-    time.sleep(1)
+    # Declare the queue topology once before the worker processes fork
+    setup_topology()
+
     # Create two Process objects, each associated with a target function
     process1 = Process(target=consumer)
     process2 = Process(target=application)
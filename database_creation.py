@@ -1,10 +1,11 @@
 import os
 
 from dotenv import load_dotenv
-from sqlalchemy import Column, String, ForeignKey, Integer, Date, Boolean, Text, DateTime, DECIMAL, MetaData
-from sqlalchemy import create_engine
+from sqlalchemy import Column, String, ForeignKey, Integer, BigInteger, Date, Boolean, Text, DateTime, DECIMAL, Index, \
+    UniqueConstraint
+from sqlalchemy import create_engine, inspect
 from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.orm import declarative_base, scoped_session, sessionmaker
 from sqlalchemy.orm import relationship
 
 # Load the .env file
@@ -20,11 +21,13 @@ db_name = os.getenv('POSTGRES_DB')
 # Create the database connection URL
 db_url = f"postgresql+psycopg2://{db_username}:{db_password}@{db_host}:{db_port}/{db_name}"
 
-# Create the engine
-engine = create_engine(db_url)
+# Create the engine with a shared connection pool; pre-ping and recycling
+# keep long-lived pooled connections healthy
+engine = create_engine(db_url, pool_size=10, max_overflow=20, pool_pre_ping=True, pool_recycle=1800)
 Base = declarative_base()
-DBSession = sessionmaker(bind=engine)
-session = DBSession()
+# scoped_session hands every thread its own session over the pooled engine,
+# so concurrent workers never share session state
+DBSession = scoped_session(sessionmaker(bind=engine, autoflush=False, expire_on_commit=False))
 
 
 class PersonalInformation(Base):
@@ -43,7 +46,22 @@ class PersonalInformation(Base):
     eyes_colors_id = Column('eyes_colors_id', String(20))
     hairs_id = Column('hairs_id', String(20))
     is_active = Column('is_active', Boolean, nullable=False)
+    # Composite index backing the listing's keyset pagination, so each page
+    # is an index range scan instead of a full sort of the table
+    __table_args__ = (
+        Index('ix_personal_name_entity', 'name', 'entity_id'),
+    )
+
+
+class PersonalInformationThumbnail(Base):
+    # Table for storing the large base64 thumbnail separately from the
+    # personal information row, so listing queries stay narrow
+    __tablename__ = "personal_information_thumbnails"
+    entity_id = Column('entity_id', String(20), ForeignKey(
+        "personal_informations.entity_id"), primary_key=True)
     thumbnail = Column('thumbnail', Text)
+    personal_informations = relationship(
+        "PersonalInformation", backref="thumbnail_row", lazy=True, foreign_keys=[entity_id])
 
 
 class LanguageInformation(Base):
@@ -51,10 +69,14 @@ class LanguageInformation(Base):
     __tablename__ = "language_informations"
     language_id = Column('language_id', Integer, primary_key=True)
     entity_id = Column('entity_id', String(20), ForeignKey(
-        "personal_informations.entity_id"))
+        "personal_informations.entity_id"), index=True)
     languages_spoken_id = Column('languages_spoken_id', String(20))
     personal_informations = relationship(
         "PersonalInformation", backref="language", lazy=True, foreign_keys=[entity_id])
+    # Natural key backing the consumer's INSERT ... ON CONFLICT upsert path
+    __table_args__ = (
+        UniqueConstraint('entity_id', 'languages_spoken_id', name='uq_language_entity_language'),
+    )
 
 
 class NationalityInformation(Base):
@@ -62,10 +84,14 @@ class NationalityInformation(Base):
     __tablename__ = "nationality_informations"
     nationality_id = Column('nationality_id', Integer, primary_key=True)
     entity_id = Column('entity_id', String(20), ForeignKey(
-        "personal_informations.entity_id"))
+        "personal_informations.entity_id"), index=True)
     nationality = Column('nationality', String(30))
     personal_informations = relationship(
         "PersonalInformation", backref="nationality", lazy=True, foreign_keys=[entity_id])
+    # Natural key backing the consumer's INSERT ... ON CONFLICT upsert path
+    __table_args__ = (
+        UniqueConstraint('entity_id', 'nationality', name='uq_nationality_entity_nationality'),
+    )
 
 
 class ArrestWarrantInformation(Base):
@@ -73,7 +99,7 @@ class ArrestWarrantInformation(Base):
     __tablename__ = "arrest_warrant_informations"
     arrest_warrant_id = Column('arrest_warrant_id', Integer, primary_key=True)
     entity_id = Column('entity_id', String(20), ForeignKey(
-        "personal_informations.entity_id"))
+        "personal_informations.entity_id"), index=True)
     issuing_country_id = Column('issuing_country_id', String(30))
     charge = Column('charge', String(1000))
     charge_translation = Column('charge_translation', String(1000))
@@ -86,7 +112,7 @@ class PictureInformation(Base):
     __tablename__ = "picture_informations"
     picture_id = Column('picture_id', Integer, primary_key=True)
     entity_id = Column('entity_id', String(20), ForeignKey(
-        "personal_informations.entity_id"))
+        "personal_informations.entity_id"), index=True)
     picture_url = Column('picture_url', String(200))
     picture_base64 = Column('picture_base64', Text)
     personal_informations = relationship(
@@ -98,7 +124,7 @@ class ChangeLogInformation(Base):
     __tablename__ = "change_log"
     log_id = Column('log_id', Integer, primary_key=True)
     entity_id = Column('entity_id', String(20), ForeignKey(
-        "personal_informations.entity_id"))
+        "personal_informations.entity_id"), index=True)
     table_name = Column(String(50), nullable=False)
     field_name = Column(String(50), nullable=False)
     old_value = Column(Text)
@@ -114,7 +140,7 @@ class LogInformation(Base):
     __tablename__ = "log"
     log_id = Column('log_id', Integer, primary_key=True)
     entity_id = Column('entity_id', String(20), ForeignKey(
-        "personal_informations.entity_id"))
+        "personal_informations.entity_id"), index=True)
     table_name = Column(String(50), nullable=False)
     action = Column(String(10), nullable=False)
     timestamp = Column(DateTime, nullable=False)
@@ -122,48 +148,57 @@ class LogInformation(Base):
     description = Column(Text)
     personal_informations = relationship(
         "PersonalInformation", backref="log", lazy=True, foreign_keys=[entity_id])
+    # Composite index for the per-entity action lookups and a plain action
+    # index for the global action counts
+    __table_args__ = (
+        Index('ix_log_entity_action', 'entity_id', 'action'),
+        Index('ix_log_action', 'action'),
+    )
 
 
-def table_exists(table_name):
-    """
-    Checks whether the specified table exists in the database.
-
-    Args:
-        table_name (str): The name of the table to check.
+class CounterInformation(Base):
+    # Table for storing running event counters maintained by the consumer,
+    # so the web interface can poll without counting the log tables
+    __tablename__ = "counters"
+    name = Column('name', String(30), primary_key=True, nullable=False)
+    value = Column('value', BigInteger, nullable=False)
 
-    Returns:
-        bool: True if the table exists, False otherwise.
-    """
-    meta = MetaData()
-    meta.reflect(bind=engine)
-    return table_name in meta.tables
 
-def create_table_if_not_exists(table_name):
+def seed_counters():
     """
-    Creates the specified table in the database if it does not already exist.
-
-    Args:
-        table_name (str): The name of the table to create.
+    Inserts the counter rows read by the web interface if they are missing,
+    so that the consumer can increment them unconditionally.
     """
-    if not table_exists(table_name):
-        Base.metadata.tables[table_name].create(engine)
-        print(f"Table {table_name} has been created.")
-    else:
-        print(f"Table {table_name} already exists.")
+    session = DBSession()
+    for name in ("added", "deleted", "changed"):
+        if not session.query(CounterInformation).filter_by(name=name).first():
+            session.add(CounterInformation(name=name, value=0))
+    session.commit()
+    DBSession.remove()
 
 def create_tables():
     # List of table names to create
     table_names = [
         "personal_informations",
+        "personal_information_thumbnails",
         "language_informations",
         "nationality_informations",
         "arrest_warrant_informations",
         "picture_informations",
         "change_log",
-        "log"
+        "log",
+        "counters"
     ]
+    # Introspect the existing tables once instead of reflecting the whole
+    # schema again for every table
+    existing_tables = set(inspect(engine).get_table_names())
     for table_name in table_names:
-        create_table_if_not_exists(table_name)
+        if table_name not in existing_tables:
+            Base.metadata.tables[table_name].create(engine)
+            print(f"Table {table_name} has been created.")
+        else:
+            print(f"Table {table_name} already exists.")
+    seed_counters()
 if __name__ == "__main__":
     # Call create_tables() function to create the tables if they don't exist
     create_tables()
@@ -1,20 +1,27 @@
+import base64
+import csv
 import datetime
-import json
+import hashlib
+import io
 import os
 from decimal import Decimal
 
+import orjson
 from dotenv import load_dotenv
-from sqlalchemy import create_engine, update, inspect
+from sqlalchemy import bindparam, create_engine, insert, update, delete, inspect
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import sessionmaker
 
 from database_creation import (
     PersonalInformation,
+    PersonalInformationThumbnail,
     ArrestWarrantInformation,
     PictureInformation,
     ChangeLogInformation,
     NationalityInformation,
-    LanguageInformation, LogInformation
+    LanguageInformation, LogInformation,
+    CounterInformation
 )
 
 # Load environment variables from .env file
@@ -31,6 +38,16 @@ db_name = os.getenv('POSTGRES_DB')
 db_url = f"postgresql+psycopg2://{db_username}:{db_password}@{db_host}:{db_port}/{db_name}"
 
 
+# Column names per table, filled lazily from the mapped classes. The schema
+# never changes at runtime, so process_data should not re-query the database
+# catalog on every call.
+_COLUMN_CACHE = {}
+
+# Above this many pictures in one message, ingestion switches from INSERT to
+# PostgreSQL's COPY protocol; below it the COPY setup is not worth the trip
+_PICTURE_COPY_THRESHOLD = 4
+
+
 # Define database operation classes
 
 class DatabaseOperationsCallback:
@@ -45,13 +62,48 @@ class DatabaseOperationsCallback:
         session (Session): An instance of SQLAlchemy Session, a handle to the database.
     """
     def __init__(self):
-        # Create an engine to connect to the PostgreSQL database
-        self.engine = create_engine(db_url)
+        # Create an engine with a connection pool so that the sessions opened
+        # per message reuse warm connections instead of reconnecting.
+        # executemany_mode lets psycopg2 batch multi-row INSERTs through
+        # execute_values/execute_batch instead of one statement per row
+        self.engine = create_engine(
+            db_url,
+            pool_size=25,
+            max_overflow=25,
+            pool_pre_ping=True,
+            executemany_mode='values_plus_batch',
+            insertmanyvalues_page_size=1000,
+            executemany_batch_page_size=500,
+            # column_data is JSONB; orjson serializes the log dicts far faster
+            # than the stdlib encoder SQLAlchemy would use by default
+            json_serializer=lambda obj: orjson.dumps(obj).decode(),
+            json_deserializer=orjson.loads
+        )
 
-        # Create a session to work with the database
+        # Create a session factory to work with the database
         self.Session = sessionmaker(bind=self.engine)
         self.session = self.Session()
 
+        # Last seen change-message hash per entity; an identical repeat from
+        # upstream is a no-op and skips all of its database work
+        self._entity_hash = {}
+
+        # Log rows and counter bumps queued by add_log_entry and
+        # add_change_log_entry; they are written out in bulk just before
+        # commit instead of one INSERT/UPDATE per call
+        self._pending_logs = []
+        self._pending_changelogs = []
+        self._pending_counts = {}
+
+        # Timestamp shared by every log row of the message being processed;
+        # one clock read per message also keeps a transaction's rows consistent
+        self._log_timestamp = datetime.datetime.now()
+
+        # Pre-built personal-information UPDATE statements keyed by the set of
+        # changed columns, so recurring change shapes skip statement
+        # construction and recompilation
+        self._update_statements = {}
+
 
     def callback_change_db(self, body):
         """
@@ -60,99 +112,136 @@ class DatabaseOperationsCallback:
         If any changes are detected, it will update the database and log the change.
         """
 
-        # Decoding the JSON data from the body of the message
-        data = json.loads(body.decode('utf-8'))
+        # Decoding the JSON data from the body of the message; orjson parses
+        # the raw bytes directly, skipping the intermediate UTF-8 decode
+        data = orjson.loads(body)
         entity_id = data['entity_id']
+        self._log_timestamp = datetime.datetime.now()
+
+        # Skip the whole comparison when upstream re-sent the exact same
+        # payload for this entity; nothing in the database can have changed
+        body_hash = hashlib.blake2b(body, digest_size=8).digest()
+        if self._entity_hash.get(entity_id) == body_hash:
+            return
 
-        # Compare the data from the queue with the data from the database
+        # Fetch the personal information row once; every key comparison below
+        # reuses the same ORM object instead of re-running an identical SELECT
+        db_personal_info = self.session.query(PersonalInformation).filter_by(entity_id=entity_id).one()
+
+        # Compare the data from the queue with the data from the database.
+        # Changed scalar fields are collected here and written back with a
+        # single multi-column UPDATE after the loop
         changes = {}
+        pending_updates = {}
         for key, value in data.items():
-            db_personal_info = self.session.query(PersonalInformation).filter_by(entity_id=entity_id).one()
-            if not isinstance(value, list) and value is not None:
+            if key == 'thumbnail':
+                # The thumbnail lives in its own table so the frequent
+                # personal-information queries stay narrow
+                if value is not None:
+                    self._sync_thumbnail(entity_id, value)
+
+            elif not isinstance(value, list) and value is not None:
                 if key == 'date_of_birth':
-                    value = datetime.datetime.strptime(value, '%Y/%m/%d').date()
+                    # The feed always uses Y/m/d, so the date is built from a
+                    # plain split instead of strptime's format interpreter
+                    year, month, day = value.split('/')
+                    value = datetime.date(int(year), int(month), int(day))
                 elif key in ['height', 'weight'] and isinstance(value, float):
-                    value = Decimal(str(value))
+                    # Height and weight carry two decimal places at most, so a
+                    # fixed-width format is both cheaper than the str() repr
+                    # round-trip and matches the database's stored precision
+                    value = Decimal(format(value, '.2f'))
                 if getattr(db_personal_info, key) != value:
                     changes[key] = {'old_value': getattr(db_personal_info, key), 'new_value': value}
                     self.add_change_log_entry(
                         key, db_personal_info.entity_id, changes[key]['old_value'], changes[key]['new_value'],
                         PersonalInformation.__tablename__, 'Change in personal information'
                     )
-                    update_statement = update(PersonalInformation).where(
-                        PersonalInformation.entity_id == entity_id
-                    ).values({key: value})
-                    self.session.execute(update_statement)
+                    pending_updates[key] = value
 
             elif key == 'languages_spoken_ids':
-                self.process_data(data['languages_spoken_ids'], entity_id, LanguageInformation)
+                self._sync_keyed_children(
+                    data['languages_spoken_ids'], entity_id, LanguageInformation, 'languages_spoken_id')
 
             elif key == 'nationalities':
-                self.process_data(data['nationalities'], entity_id, NationalityInformation)
+                self._sync_keyed_children(
+                    data['nationalities'], entity_id, NationalityInformation, 'nationality')
 
             elif key == 'arrest_warrants':
                 self.process_data(data['arrest_warrants'], entity_id, ArrestWarrantInformation)
 
             elif key == 'pictures':
-                # Retrieve existing PictureInformation objects from the database for the given entity_id
-                db_picture_ids = [d.picture_id for d in
-                                  self.session.query(PictureInformation).filter_by(entity_id=entity_id).all()]
+                # Retrieve the existing PictureInformation rows once and keep
+                # them around by id; the delete loop below reuses these objects
+                # instead of re-selecting each row by picture_id
+                db_pictures = self.session.query(PictureInformation).filter_by(entity_id=entity_id).all()
+                pictures_by_id = {p.picture_id: p for p in db_pictures}
+                db_picture_ids = list(pictures_by_id)
                 if data['pictures'] and db_picture_ids:
-                    queue_picture_ids = [int(q['picture_id']) for q in data['pictures']]
+                    # Key the queue pictures by id so both directions of the
+                    # diff are set differences instead of nested list scans
+                    queue_pictures_by_id = {int(q['picture_id']): q for q in data['pictures']}
 
                     # Delete PictureInformation objects from the database that are not in the queue
-                    delete_ids = [q for q in db_picture_ids if q not in queue_picture_ids]
+                    delete_ids = pictures_by_id.keys() - queue_pictures_by_id.keys()
                     for picture_id in delete_ids:
-                        picture_info = self.session.query(PictureInformation).filter_by(picture_id=picture_id).first()
-                        if picture_info:
-                            picture_data = {
-                                'entity_id': picture_info.entity_id,
-                                'picture_id': picture_info.picture_id,
-                                'picture_url': picture_info.picture_url,
-                                'picture_base64': picture_info.picture_base64
-                            }
-                            self.session.delete(picture_info)
-                            self.add_log_entry(entity_id, PictureInformation.__tablename__, 'Deleted', picture_data)
-
-                    # Add new PictureInformation objects to the database that are not in the database but in the queue
-                    new_picture_ids = [p for p in queue_picture_ids if p not in db_picture_ids]
+                        picture_info = pictures_by_id[picture_id]
+                        picture_data = {
+                            'entity_id': picture_info.entity_id,
+                            'picture_id': picture_info.picture_id,
+                            'picture_url': picture_info.picture_url,
+                            'picture_base64': picture_info.picture_base64
+                        }
+                        self.add_log_entry(entity_id, PictureInformation.__tablename__, 'Deleted', picture_data)
+                    if delete_ids:
+                        self.session.execute(
+                            delete(PictureInformation).where(PictureInformation.picture_id.in_(delete_ids)))
+
+                    # Add new pictures that are in the queue but not in the
+                    # database, as plain dicts through the bulk insert path
                     new_pictures = []
-                    for p in new_picture_ids:
-                        for f in data['pictures']:
-                            if p == int(f['picture_id']):
-                                picture = PictureInformation(
-                                    picture_id=p,
-                                    entity_id=entity_id,
-                                    picture_url=f['picture_url'],
-                                    picture_base64=f['picture_base64']
-                                )
-                                picture_data = {
-                                    'entity_id': entity_id,
-                                    'picture_id': p,
-                                    'picture_url': f['picture_url'],
-                                    'picture_base64': f['picture_base64']
-                                }
-                                new_pictures.append(picture)
-                                self.add_log_entry(entity_id, PictureInformation.__tablename__, 'Added', picture_data)
-
-                    self.session.add_all(new_pictures)
+                    for p in queue_pictures_by_id.keys() - pictures_by_id.keys():
+                        f = queue_pictures_by_id[p]
+                        picture_data = {
+                            'entity_id': entity_id,
+                            'picture_id': p,
+                            'picture_url': f['picture_url'],
+                            'picture_base64': f['picture_base64']
+                        }
+                        new_pictures.append(picture_data)
+                        self.add_log_entry(entity_id, PictureInformation.__tablename__, 'Added', picture_data)
+
+                    if new_pictures:
+                        self.session.bulk_insert_mappings(PictureInformation, new_pictures)
 
                 elif not data['pictures'] and db_picture_ids:
-                    for db_id in db_picture_ids:
-                        picture_db = self.session.query(PictureInformation).filter_by(picture_id=db_id).one()
+                    # All of the entity's pictures are gone upstream: log each
+                    # already-fetched row and remove them with one DELETE
+                    for picture_db in db_pictures:
                         picture_data = {
                             'entity_id': picture_db.entity_id,
                             'picture_id': picture_db.picture_id,
                             'picture_url': picture_db.picture_url,
                             'picture_base64': picture_db.picture_base64
                         }
-                        self.session.query(PictureInformation).filter_by(picture_id=db_id).delete()
                         self.add_log_entry(picture_db.entity_id, PictureInformation.__tablename__, 'Deleted',
                                            picture_data)
+                    self.session.execute(
+                        delete(PictureInformation).where(PictureInformation.entity_id == entity_id))
+
+        # Write every changed scalar field back in one UPDATE statement, built
+        # once per column shape and driven purely by bound parameters
+        if pending_updates:
+            update_statement = self._personal_update_statement(pending_updates)
+            self.session.execute(update_statement, {'b_entity_id': entity_id, **pending_updates})
 
         # add a new change log entry to the database
 
-        self.handle_database_transaction()
+        # Only remember the payload hash once its changes are actually
+        # committed; otherwise a redelivery of the same payload would be
+        # skipped as a duplicate and the update lost for good
+        if self.handle_database_transaction():
+            self._entity_hash[entity_id] = body_hash
 
     def process_data(self, data, entity_id, table_name):
         """
@@ -165,81 +254,163 @@ class DatabaseOperationsCallback:
         entity_id (int): The entity ID that the data is associated with.
         table_name (sqlalchemy.ext.declarative.api.DeclarativeMeta): The table where data will be processed.
         """
-        # Retrieve the column names of the table
-        inspector = inspect(self.engine)
-        columns = inspector.get_columns(table_name.__tablename__)
-        columns = [column['name'] for column in columns]
+        # Retrieve the column names of the table from the mapper (no catalog
+        # round-trip) and cache them for subsequent calls
+        columns = _COLUMN_CACHE.get(table_name.__tablename__)
+        if columns is None:
+            columns = [column.key for column in inspect(table_name).columns]
+            _COLUMN_CACHE[table_name.__tablename__] = columns
 
         # Query existing data from the table
         db_infos = self.session.query(table_name).filter_by(entity_id=entity_id).all()
-        items_list = []
-        ids_list = []
         if data:
             if db_infos:
-                # Iterate over existing items and create dictionaries for comparison
+                # Key both sides on their sorted (column, value) pairs so the
+                # additions and removals fall out of two set differences
+                # instead of nested list scans
+                # The columns come from the mapper, so every one of them is
+                # guaranteed to exist on the row objects
+                existing_map = {}
                 for item in db_infos:
-                    item_dict = {}
-                    ids = {}
-                    ids[columns[0]] = getattr(item, columns[0])
-                    for column in columns[1:]:
-                        if hasattr(item, column):
-                            column_value = getattr(item, column)
-                            item_dict[column] = column_value
-                            ids[column] = column_value
-                    items_list.append(item_dict)
-                    ids_list.append(ids)
-
-                # Check new data and add items that are not in the existing list
-                for d in data:
-                    if d not in items_list:
-                        item_dict = {}
-                        for column in columns[2:]:
-                            column_value = d[column]
-                            item_dict[column] = column_value
-                        item_dict['entity_id'] = entity_id
-                        item_info = table_name(**item_dict)
-                        self.session.add(item_info)
-                        self.add_log_entry(item_dict['entity_id'], table_name.__tablename__, 'Added', item_dict)
-
-                # Check existing items and remove items that are not in the new data
-                for item in items_list:
-                    if item not in data:
-                        for id in ids_list:
-                            if all(id[column] == item[column] for column in columns[1:]):
-                                filter_conditions = []
-                                filter_conditions.append(getattr(table_name, columns[0]) == id[columns[0]])
-                                dict_data = {column: id[column] for column in columns[1:]}
-                                self.session.query(table_name).filter(*filter_conditions).delete()
-                                self.add_log_entry(id[columns[1]], table_name.__tablename__, 'Deleted', dict_data)
+                    item_dict = {column: getattr(item, column) for column in columns[1:]}
+                    existing_map[tuple(sorted(item_dict.items()))] = (getattr(item, columns[0]), item_dict)
+                new_map = {tuple(sorted(d.items())): d for d in data}
+
+                # Add items that are in the new data but not in the database,
+                # as plain dicts through the bulk insert path
+                new_rows = []
+                for key in new_map.keys() - existing_map.keys():
+                    d = new_map[key]
+                    item_dict = {column: d[column] for column in columns[2:]}
+                    item_dict['entity_id'] = entity_id
+                    new_rows.append(item_dict)
+                    self.add_log_entry(item_dict['entity_id'], table_name.__tablename__, 'Added', item_dict)
+                if new_rows:
+                    self.session.bulk_insert_mappings(table_name, new_rows)
+
+                # Remove items that are in the database but not in the new data,
+                # with one batched DELETE for all of them
+                to_delete_ids = []
+                for key in existing_map.keys() - new_map.keys():
+                    db_id, item_dict = existing_map[key]
+                    to_delete_ids.append(db_id)
+                    self.add_log_entry(item_dict['entity_id'], table_name.__tablename__, 'Deleted', item_dict)
+                if to_delete_ids:
+                    self.session.execute(
+                        delete(table_name).where(getattr(table_name, columns[0]).in_(to_delete_ids)))
 
             else:
-                # If no existing data, add all items from the new data
+                # If no existing data, add all items from the new data in bulk
+                new_rows = []
                 for d in data:
                     item_dict = {}
                     for column in columns[1:]:
                         column_value = d[column]
                         item_dict[column] = column_value
                     item_dict['entity_id'] = entity_id
-                    item_info = table_name(**item_dict)
-                    self.session.add(item_info)
+                    new_rows.append(item_dict)
                     self.add_log_entry(item_dict['entity_id'], table_name.__tablename__, 'Added', item_dict)
+                if new_rows:
+                    self.session.bulk_insert_mappings(table_name, new_rows)
 
         elif db_infos and not data:
-            # If no data, remove existing data
+            # If no data, remove all existing rows with one batched DELETE
+            to_delete_ids = []
             for item in db_infos:
-                item_dict = {}
-                for column in columns[1:]:
-                    if hasattr(item, column):
-                        column_value = getattr(item, column)
-                        item_dict[column] = column_value
-                db_id_val = getattr(item, columns[0])
-                self.session.query(table_name).filter(getattr(table_name, columns[0]) == db_id_val).delete()
+                item_dict = {column: getattr(item, column) for column in columns[1:]}
+                to_delete_ids.append(getattr(item, columns[0]))
                 self.add_log_entry(item_dict['entity_id'], table_name.__tablename__, 'Deleted', item_dict)
+            self.session.execute(
+                delete(table_name).where(getattr(table_name, columns[0]).in_(to_delete_ids)))
+
+    def _personal_update_statement(self, pending_updates):
+        """
+        Returns the cached personal-information UPDATE statement for the given
+        set of changed columns, building it on first use. Every value,
+        including the entity id, is a bound parameter, so the same statement
+        object serves every message with that change shape.
+
+        Parameters:
+        pending_updates (dict): The changed columns and their new values.
+        """
+        cache_key = frozenset(pending_updates)
+        statement = self._update_statements.get(cache_key)
+        if statement is None:
+            statement = update(PersonalInformation).where(
+                PersonalInformation.entity_id == bindparam('b_entity_id')
+            ).values({column: bindparam(column) for column in cache_key})
+            self._update_statements[cache_key] = statement
+        return statement
+
+    def _sync_keyed_children(self, data, entity_id, table_name, key_column):
+        """
+        Synchronizes a child table whose rows are fully described by a single
+        natural-key column, using PostgreSQL's INSERT ... ON CONFLICT DO NOTHING
+        plus one batched DELETE instead of the select-and-diff in process_data.
+        The RETURNING clauses report which rows actually changed, so the log
+        entries stay identical to the diff-based path.
+
+        Parameters:
+        data (list of dict): The new data to be synchronized.
+        entity_id (str): The entity ID that the data is associated with.
+        table_name (sqlalchemy.orm.DeclarativeBase): The child table being synchronized.
+        key_column (str): The natural-key column carried by each data dict.
+        """
+        key_attr = getattr(table_name, key_column)
+        kept_values = []
+        if data:
+            rows = [{'entity_id': entity_id, key_column: d[key_column]} for d in data]
+            kept_values = [row[key_column] for row in rows]
+            inserted = self.session.execute(
+                pg_insert(table_name).values(rows)
+                .on_conflict_do_nothing(index_elements=['entity_id', key_column])
+                .returning(key_attr)
+            ).scalars().all()
+            for value in inserted:
+                self.add_log_entry(entity_id, table_name.__tablename__, 'Added',
+                                   {'entity_id': entity_id, key_column: value})
+
+        delete_statement = delete(table_name).where(table_name.entity_id == entity_id)
+        if kept_values:
+            delete_statement = delete_statement.where(key_attr.notin_(kept_values))
+        deleted = self.session.execute(delete_statement.returning(key_attr)).scalars().all()
+        for value in deleted:
+            self.add_log_entry(entity_id, table_name.__tablename__, 'Deleted',
+                               {'entity_id': entity_id, key_column: value})
+
+    def _sync_thumbnail(self, entity_id, thumbnail):
+        """
+        Inserts or updates the thumbnail row for the given entity, logging a
+        change entry when an existing thumbnail differs from the new value.
+
+        Parameters:
+        entity_id (str): The entity ID the thumbnail belongs to.
+        thumbnail (str): The base64-encoded thumbnail data.
+        """
+        thumbnail_row = self.session.query(PersonalInformationThumbnail).filter_by(entity_id=entity_id).first()
+        if thumbnail_row is None:
+            self.session.add(PersonalInformationThumbnail(entity_id=entity_id, thumbnail=thumbnail))
+        elif thumbnail_row.thumbnail != thumbnail:
+            self.add_change_log_entry(
+                'thumbnail', entity_id, thumbnail_row.thumbnail, thumbnail,
+                PersonalInformationThumbnail.__tablename__, 'Change in personal information'
+            )
+            thumbnail_row.thumbnail = thumbnail
+
+    def _increment_counter(self, name):
+        """
+        Queues a bump of the named running counter; the accumulated total is
+        applied with one UPDATE per counter just before commit.
+
+        Parameters:
+        name (str): The counter to increment ('added', 'deleted' or 'changed').
+        """
+        self._pending_counts[name] = self._pending_counts.get(name, 0) + 1
 
     def add_change_log_entry(self, key, entity_id, old_value, new_value, table_name, description):
         """
-        Creates a new change log entry in the database by creating a new ChangeLogInformation object,
-        and then adds it to the current session to be committed later.
+        Queues a new change log entry; all entries accumulated for the current
+        message are written with a single bulk INSERT just before commit.
 
         Parameters:
         key (str): The field name where the change occurred.
@@ -249,23 +420,21 @@ class DatabaseOperationsCallback:
         table_name (str): The table name where the change occurred.
         description (str): A description of the change that occurred.
         """
-        # Create a ChangeLogInformation object with the provided data
-        change_log_entry = ChangeLogInformation(
-            entity_id=entity_id,
-            table_name=table_name,
-            field_name=key,
-            old_value=str(old_value),
-            new_value=str(new_value),
-            description=description,
-            change_date=datetime.datetime.now()
-        )
-        # Add the ChangeLogInformation object to the session to be committed to the database
-        self.session.add(change_log_entry)
+        self._pending_changelogs.append({
+            'entity_id': entity_id,
+            'table_name': table_name,
+            'field_name': key,
+            'old_value': str(old_value),
+            'new_value': str(new_value),
+            'description': description,
+            'change_date': self._log_timestamp
+        })
+        self._increment_counter('changed')
 
     def add_log_entry(self, entity_id, table_name, action, column_data, description=None):
         """
-        Creates a new log entry in the database by creating a new LogInformation object,
-        and then adds it to the current session to be committed later.
+        Queues a new log entry; all entries accumulated for the current
+        message are written with a single bulk INSERT just before commit.
 
         Parameters:
         entity_id (int): The entity ID related to the log.
@@ -274,27 +443,89 @@ class DatabaseOperationsCallback:
         column_data (dict): The data that was acted upon.
         description (str, optional): A description of the action that took place.
         """
-        change_log_entry = LogInformation(
-            entity_id=entity_id,
-            table_name=table_name,
-            action=action,
-            timestamp=datetime.datetime.now(),
-            column_data=column_data,
-            description=description
-        )
-        self.session.add(change_log_entry)
+        self._pending_logs.append({
+            'entity_id': entity_id,
+            'table_name': table_name,
+            'action': action,
+            'timestamp': self._log_timestamp,
+            'column_data': column_data,
+            'description': description
+        })
+        if action == 'Added':
+            self._increment_counter('added')
+        elif action == 'Deleted':
+            self._increment_counter('deleted')
+
+    def _flush_pending_logs(self):
+        """
+        Writes the queued log rows, change-log rows and counter bumps with one
+        bulk statement each, then clears the queues.
+        """
+        if self._pending_logs:
+            self.session.execute(insert(LogInformation), self._pending_logs)
+            self._pending_logs = []
+        if self._pending_changelogs:
+            self.session.execute(insert(ChangeLogInformation), self._pending_changelogs)
+            self._pending_changelogs = []
+        for name, count in self._pending_counts.items():
+            self.session.execute(
+                update(CounterInformation)
+                .where(CounterInformation.name == name)
+                .values(value=CounterInformation.value + count)
+            )
+        self._pending_counts = {}
 
     def callback_db(self, body):
         """
         A callback function that processes an incoming message and updates the database accordingly.
-        This function parses the JSON data from the message, creates various database objects
-        depending on the data received, and adds them to the current session to be committed later.
 
         Parameters:
         body (bytes): The raw message data received.
         """
-        # Parse the message data as JSON
-        data = json.loads(body.decode('utf-8'))
+        self._log_timestamp = datetime.datetime.now()
+        self._ingest_person(body)
+        self.handle_database_transaction()
+
+    def callback_db_many(self, bodies):
+        """
+        Processes a batch of incoming messages and commits them in a single
+        transaction, so the whole window shares one commit instead of paying
+        one commit per message.
+
+        Parameters:
+        bodies (list of bytes): The raw message bodies received.
+        """
+        self._log_timestamp = datetime.datetime.now()
+        try:
+            for body in bodies:
+                self._ingest_person(body)
+            committed = self.handle_database_transaction()
+        except Exception:
+            # Anything a single message can raise — an IntegrityError or
+            # DataError surfacing at flush time, a malformed payload — must
+            # not take the rest of the window down with it
+            self.discard_failed_transaction()
+            committed = False
+        if not committed:
+            # One poison message (e.g. a redelivery whose ack was lost)
+            # spoiled the whole window; replay the messages one at a time so
+            # only the genuinely failing ones are dropped
+            for body in bodies:
+                try:
+                    self.callback_db(body)
+                except Exception:
+                    self.discard_failed_transaction()
+
+    def _ingest_person(self, body):
+        """
+        Parses the JSON data from a message, creates the corresponding database
+        objects, and adds them to the current session to be committed later.
+
+        Parameters:
+        body (bytes): The raw message data received.
+        """
+        # Parse the message data as JSON straight from the raw bytes
+        data = orjson.loads(body)
 
         # Create a PersonalInformation object with the received data
         personal_info_data = {
@@ -310,8 +541,7 @@ class DatabaseOperationsCallback:
             'hairs_id': data['hairs_id'],
             'distinguishing_marks': data['distinguishing_marks'],
             'weight': data['weight'],
-            'is_active': data['is_active'],
-            'thumbnail': data['thumbnail']
+            'is_active': data['is_active']
         }
 
         personal_info = PersonalInformation(**personal_info_data)
@@ -320,8 +550,17 @@ class DatabaseOperationsCallback:
         self.session.add(personal_info)
         self.add_log_entry(data['entity_id'], PersonalInformation.__tablename__, 'Added', personal_info_data)
 
-        # If there are arrest warrants in the message, create ArrestWarrantInformation objects and add them to the session
+        # Store the large base64 thumbnail in its side table
+        if data['thumbnail'] is not None:
+            self.session.add(PersonalInformationThumbnail(entity_id=data['entity_id'], thumbnail=data['thumbnail']))
+
+        # Collect the rows for each child table as plain dicts and insert them
+        # with one bulk INSERT per table, instead of one ORM instance and one
+        # statement per row
+
+        # If there are arrest warrants in the message, insert them in bulk
         if not data['arrest_warrants'] is None:
+            warrant_rows = []
             for warrant in data['arrest_warrants']:
                 warrant_data = {
                     'entity_id': data['entity_id'],
@@ -329,12 +568,14 @@ class DatabaseOperationsCallback:
                     'charge': warrant['charge'],
                     'charge_translation': warrant['charge_translation']
                 }
-                warrant_info = ArrestWarrantInformation(**warrant_data)
-                self.session.add(warrant_info)
+                warrant_rows.append(warrant_data)
                 self.add_log_entry(data['entity_id'], ArrestWarrantInformation.__tablename__, 'Added', warrant_data)
+            if warrant_rows:
+                self.session.execute(insert(ArrestWarrantInformation), warrant_rows)
 
         # Insert picture information into the database, if any
         if not data['pictures'] is None:
+            picture_rows = []
             for p in data['pictures']:
                 picture_data = {
                     'entity_id': data['entity_id'],
@@ -342,45 +583,127 @@ class DatabaseOperationsCallback:
                     'picture_url': p['picture_url'],
                     'picture_base64': p['picture_base64']
                 }
-                picture_info = PictureInformation(**picture_data)
-                self.session.add(picture_info)
+                picture_rows.append(picture_data)
                 self.add_log_entry(data['entity_id'], PictureInformation.__tablename__, 'Added', picture_data)
+            if len(picture_rows) > _PICTURE_COPY_THRESHOLD:
+                self._copy_pictures(picture_rows)
+            elif picture_rows:
+                self.session.execute(insert(PictureInformation), picture_rows)
 
         # Add language information to the database, if any
         if not data['languages_spoken_ids'] is None:
+            language_rows = []
             for l in data['languages_spoken_ids']:
                 language_data = {
                     'entity_id': data['entity_id'],
                     'languages_spoken_id': l['languages_spoken_id']
                 }
-                language_info = LanguageInformation(**language_data)
-                self.session.add(language_info)
+                language_rows.append(language_data)
                 self.add_log_entry(data['entity_id'], LanguageInformation.__tablename__, 'Added', language_data)
+            if language_rows:
+                self.session.execute(insert(LanguageInformation), language_rows)
 
         # Add nationality information to the database, if any
         if not data['nationalities'] is None:
+            nationality_rows = []
             for n in data['nationalities']:
                 nationality_data = {
                     'entity_id': data['entity_id'],
                     'nationality': n['nationality']
                 }
-                nationality_info = NationalityInformation(**nationality_data)
-                self.session.add(nationality_info)
+                nationality_rows.append(nationality_data)
                 self.add_log_entry(data['entity_id'], NationalityInformation.__tablename__, 'Added', nationality_data)
+            if nationality_rows:
+                self.session.execute(insert(NationalityInformation), nationality_rows)
 
-        self.handle_database_transaction()
+    def _copy_pictures(self, picture_rows):
+        """
+        Streams picture rows into the database with COPY FROM STDIN, which
+        bypasses the statement parser and is the fastest PostgreSQL ingestion
+        path for the large base64 payloads.
+
+        Parameters:
+        picture_rows (list of dict): The picture rows to insert.
+        """
+        # The parent personal-information row must exist before the FK rows
+        # arrive, and COPY goes around the ORM's autoflush
+        self.session.flush()
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in picture_rows:
+            writer.writerow([row['entity_id'], row['picture_id'], row['picture_url'], row['picture_base64']])
+        buffer.seek(0)
+        cursor = self.session.connection().connection.cursor()
+        cursor.copy_expert(
+            "COPY picture_informations (entity_id, picture_id, picture_url, picture_base64) FROM STDIN WITH CSV",
+            buffer
+        )
+
+    def callback_image_db(self, body, headers):
+        """
+        This method stores one raw image from the 'images' queue, encoding it
+        and upserting it into the picture row identified by the headers. The
+        picture metadata rows arrive through the person messages, so the image
+        may land before or after its row exists.
+
+        Parameters:
+        body (bytes): The raw image bytes.
+        headers (dict): The picture metadata carried in the message headers.
+        """
+        statement = pg_insert(PictureInformation).values(
+            picture_id=int(headers['picture_id']),
+            entity_id=headers['entity_id'],
+            picture_url=headers.get('picture_url'),
+            picture_base64=base64.b64encode(body).decode('ascii')
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=['picture_id'],
+            set_={
+                'picture_url': statement.excluded.picture_url,
+                'picture_base64': statement.excluded.picture_base64,
+            }
+        )
+        try:
+            self.session.execute(statement)
+            self.session.commit()
+        except Exception:
+            # The personal-information row may not have been committed yet;
+            # roll back and let the consumer requeue the image
+            self.session.rollback()
+            raise
+
+    def discard_failed_transaction(self):
+        """
+        Resets the session after a message fails mid-processing: the open
+        transaction is rolled back and the log rows and counter bumps queued
+        by the failed message are dropped, so the long-lived session starts
+        the next message clean instead of carrying a failed transaction and
+        phantom log entries forward.
+        """
+        self.session.rollback()
+        self._pending_logs = []
+        self._pending_changelogs = []
+        self._pending_counts = {}
 
     def handle_database_transaction(self):
         """
         This method handles the commit and rollback operations for database transactions.
         If an IntegrityError occurs during the commit, the transaction will be rolled back.
-        The session is closed at the end, regardless of whether the commit was successful or not.
+        The session itself stays open across messages so its pooled connection
+        is reused instead of being released and re-acquired every time.
+
+        Returns:
+        bool: Whether the commit went through.
         """
         try:
+            self._flush_pending_logs()
             self.session.commit()
         except IntegrityError:
             # If there is an integrity error during commit, rollback the transaction
+            # and drop whatever log rows were queued for it
             self.session.rollback()
-        finally:
-            # Close the session to release resources
-            self.session.close()
+            self._pending_logs = []
+            self._pending_changelogs = []
+            self._pending_counts = {}
+            return False
+        return True
@@ -2,6 +2,9 @@ import os
 from dotenv import load_dotenv
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import create_engine
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import scoped_session, sessionmaker
 
 load_dotenv()
 
@@ -21,6 +24,18 @@ app.config[
 # Initialize a SQLAlchemy object
 db = SQLAlchemy(app)
 
+# Separate read-only engine for the browse endpoints. It defaults to the
+# primary database but can be pointed at a read replica via POSTGRES_READ_URL
+# without any code change; the read-only transaction option keeps long
+# consumer write transactions from ever blocking these sessions.
+read_engine = create_engine(
+    os.getenv('POSTGRES_READ_URL', app.config['SQLALCHEMY_DATABASE_URI']),
+    pool_size=10,
+    pool_pre_ping=True,
+    connect_args={'options': '-c default_transaction_read_only=on'}
+)
+ReadSession = scoped_session(sessionmaker(bind=read_engine))
+
 # Define a model for the "personal_informations" table
 class AppPersonalInformation(db.Model):
     __tablename__ = "personal_informations"
@@ -37,34 +52,55 @@ class AppPersonalInformation(db.Model):
     eyes_colors_id = db.Column(db.String(20))
     hairs_id = db.Column(db.String(20))
     is_active = db.Column(db.Boolean, nullable=False)
-    thumbnail = db.Column(db.Text)
+    __table_args__ = (
+        db.Index('ix_personal_name_entity', 'name', 'entity_id'),
+    )
+
+
+# Define a model for the "personal_information_thumbnails" table
+class AppPersonalInformationThumbnail(db.Model):
+    __tablename__ = "personal_information_thumbnails"
+    entity_id = db.Column('entity_id', db.String(20), db.ForeignKey("personal_informations.entity_id"),
+                          primary_key=True)
+    thumbnail = db.Column('thumbnail', db.Text)
+    personal_informations = db.relationship("AppPersonalInformation", backref="thumbnail_row", lazy=True,
+                                            foreign_keys=[entity_id])
 
 
 # Define a model for the "language_informations" table
 class AppLanguageInformation(db.Model):
     __tablename__ = "language_informations"
     language_id = db.Column('language_id', db.Integer, primary_key=True)
-    entity_id = db.Column('entity_id', db.String(20), db.ForeignKey("personal_informations.entity_id"))
+    entity_id = db.Column('entity_id', db.String(20), db.ForeignKey("personal_informations.entity_id"),
+                          index=True)
     languages_spoken_id = db.Column('languages_spoken_id', db.String(20))
     personal_informations = db.relationship("AppPersonalInformation", backref="language", lazy=True,
                                             foreign_keys=[entity_id])
+    __table_args__ = (
+        db.UniqueConstraint('entity_id', 'languages_spoken_id', name='uq_language_entity_language'),
+    )
 
 
 # Define a model for the "nationality_informations" table
 class AppNationalityInformation(db.Model):
     __tablename__ = "nationality_informations"
     nationality_id = db.Column('nationality_id', db.Integer, primary_key=True)
-    entity_id = db.Column('entity_id', db.String(20), db.ForeignKey("personal_informations.entity_id"))
+    entity_id = db.Column('entity_id', db.String(20), db.ForeignKey("personal_informations.entity_id"),
+                          index=True)
     nationality = db.Column('nationality', db.String(30))
     personal_informations = db.relationship("AppPersonalInformation", backref="nationality", lazy=True,
                                             foreign_keys=[entity_id])
+    __table_args__ = (
+        db.UniqueConstraint('entity_id', 'nationality', name='uq_nationality_entity_nationality'),
+    )
 
 
 # Define a model for the "picture_informations" table
 class AppPictureInformation(db.Model):
     __tablename__ = "picture_informations"
     picture_id = db.Column('picture_id', db.Integer, primary_key=True)
-    entity_id = db.Column('entity_id', db.String(20), db.ForeignKey("personal_informations.entity_id"))
+    entity_id = db.Column('entity_id', db.String(20), db.ForeignKey("personal_informations.entity_id"),
+                          index=True)
     picture_url = db.Column('picture_url', db.String(200))
     picture_base64 = db.Column('picture_base64', db.Text)
     personal_informations = db.relationship("AppPersonalInformation", backref="picture_of_the_criminal", lazy=True,
@@ -75,7 +111,8 @@ class AppPictureInformation(db.Model):
 class AppChangeAppLogInformation(db.Model):
     __tablename__ = "change_log"
     log_id = db.Column('log_id', db.Integer, primary_key=True)
-    entity_id = db.Column('entity_id', db.String(20), db.ForeignKey("personal_informations.entity_id"))
+    entity_id = db.Column('entity_id', db.String(20), db.ForeignKey("personal_informations.entity_id"),
+                          index=True)
     table_name = db.Column(db.String(50), nullable=False)
     field_name = db.Column(db.String(50), nullable=False)
     old_value = db.Column(db.Text)
@@ -90,21 +127,34 @@ class AppChangeAppLogInformation(db.Model):
 class AppLogInformation(db.Model):
     __tablename__ = "log"
     log_id = db.Column('log_id', db.Integer, primary_key=True)
-    entity_id = db.Column('entity_id', db.String(20), db.ForeignKey("personal_informations.entity_id"))
+    entity_id = db.Column('entity_id', db.String(20), db.ForeignKey("personal_informations.entity_id"),
+                          index=True)
     table_name = db.Column(db.String(50), nullable=False)
     action = db.Column(db.String(10), nullable=False)
     timestamp = db.Column(db.DateTime, nullable=False)
-    column_data = db.Column(db.TEXT)
+    column_data = db.Column(JSONB)
     description = db.Column(db.Text)
     personal_informations = db.relationship("AppPersonalInformation", backref="log", lazy=True,
                                             foreign_keys=[entity_id])
+    __table_args__ = (
+        db.Index('ix_log_entity_action', 'entity_id', 'action'),
+        db.Index('ix_log_action', 'action'),
+    )
+
+
+# Define a model for the "counters" table
+class AppCounterInformation(db.Model):
+    __tablename__ = "counters"
+    name = db.Column('name', db.String(30), primary_key=True, nullable=False)
+    value = db.Column('value', db.BigInteger, nullable=False)
 
 
 # Define a model for the "arrest_warrant_informations" table
 class AppArrestWarrantInformation(db.Model):
     __tablename__ = "arrest_warrant_informations"
     arrest_warrant_id = db.Column('arrest_warrant_id', db.Integer, primary_key=True)
-    entity_id = db.Column('entity_id', db.String(20), db.ForeignKey("personal_informations.entity_id"))
+    entity_id = db.Column('entity_id', db.String(20), db.ForeignKey("personal_informations.entity_id"),
+                          index=True)
     issuing_country_id = db.Column('issuing_country_id', db.String(30))
     charge = db.Column('charge', db.String(1000))
     charge_translation = db.Column('charge_translation', db.String(1000))
@@ -1,16 +1,20 @@
 import base64
-import json
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 
+import orjson
 import pika
+import zstandard as zstd
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, update
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.exc import IntegrityError
 import datetime
-from models import AppPersonalInformation, AppChangeAppLogInformation
+from models import AppPersonalInformation, AppChangeAppLogInformation, AppCounterInformation
 
 load_dotenv()
 
@@ -25,10 +29,62 @@ rabbitmq_host = os.getenv('RABBITMQ_HOST')
 # Create the database connection URL
 db_url = f"postgresql+psycopg2://{db_username}:{db_password}@{db_host}:{db_port}/{db_name}"
 
-# Create the engine
-engine = create_engine(db_url)
+# Create the engine once for the process; every retrieval cycle draws its
+# session from this shared pool instead of building a fresh engine (and
+# throwing away its warm connections) every two seconds
+engine = create_engine(db_url, pool_size=5, max_overflow=10, pool_pre_ping=True)
 DBSession = sessionmaker(bind=engine)
-session = DBSession()
+
+# One shared HTTP session for the whole crawl, so TCP connections and TLS
+# handshakes to the Interpol API are reused across the hundreds of per-person
+# and per-image requests instead of being re-established each time. Transient
+# failures are retried by the adapter with exponential backoff (and a
+# Retry-After-aware pause on 429) instead of an unbounded sleep loop
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=64,
+    max_retries=Retry(
+        total=6,
+        backoff_factor=0.4,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=['GET'],
+        respect_retry_after_header=True
+    )
+))
+
+# Worker pools that overlap the I/O waits on the Interpol API. Person fetches
+# and their nested per-image fetches run on separate pools, so person tasks
+# can never occupy every worker while waiting on their own image downloads
+PERSON_POOL = ThreadPoolExecutor(max_workers=int(os.getenv('CRAWLER_PERSON_WORKERS', '8')))
+IMAGE_POOL = ThreadPoolExecutor(max_workers=int(os.getenv('CRAWLER_IMAGE_WORKERS', '16')))
+
+# Encoded images memoized by URL. Interpol serves each picture under a stable
+# per-id URL, so after the first cycle the crawl stops re-downloading and
+# re-encoding the same images every two seconds
+_IMAGE_CACHE = {}
+
+# Raw image bytes memoized by URL for the pictures that travel the binary
+# images queue without any base64 encoding
+_IMAGE_BYTES_CACHE = {}
+
+# Parsed JSON payloads keyed by URL, valid for one retrieval cycle; repeated
+# hits on the same endpoint within a cycle reuse the parsed dict instead of
+# re-fetching and re-deserializing the same bytes
+_JSON_CACHE = {}
+
+# Fully-built person payloads keyed by detail URL together with the ETag the
+# API served them under. Later cycles revalidate with If-None-Match and reuse
+# the cached payload on 304 Not Modified, skipping the rebuild entirely
+_PERSON_CACHE = {}
+
+# Shared zstd compressor for the JSON message bodies; base64-heavy ASCII
+# compresses well at level 3 and the consumer decompresses by content_encoding
+_COMPRESSOR = zstd.ZstdCompressor(level=3)
+
+# Placeholder image used when a notice has no thumbnail; hoisted to module
+# scope so every person without a thumbnail shares the same string object
+DEFAULT_THUMBNAIL_B64 = 'iVBORw0KGgoAAAANSUhEUgAAAKoAAACqAgMAAABAGDwRAAAADFBMVEWutLfk5ufb3d/EyMpaqx/2AAACUUlEQVRYw+3YK3LcQBAA0LZUBgJKkI8gHiLgoD3CAu1IVREQ3wU6gi6xPNQh2QMEzA2CdASDsFCTOJWsVur5dPeM7VTsKgm/mur5dfcIdsHfFla72tWudrVv0359/BFqTwDwEGYP8Oe7D7FK/7XvQux5WM/AHqsnm8u2mSikR9H2FwuFaPVsc8nWM4VUsu1iYRRsj2wpWI1sxluFKCS8rbBNeYunZk/Otp1hC9ZuDFuyVhs2Y61B4YqztWkTzlamTTnbmBaOjG0tOzJ2a9kbxnaWLRjbR9iNZcsIe83Y4Rk2Y6y2bP4fLLyxcV+jzV7oPMScs5iz3j/DFhH3+CYiP4wReecYnvsgIqeyeVJF5GrrQOSsHSLqRR9Rhzp6Kxzb0Mvr2DqiHu/oZXDtQJ10j+3I0u3ahpyaaxXZlnj6s4EK12MPVMvlsTXVyvn61NNkbwNsS7Sp3h785B/Wa/f+Yf3vgL2G98fQ94W6+xfvlv3jB/j+KyRe9W1aswfRqp/zHn8ULKLOEtv2ZNzN+114nkyZPKki6ttnu3YbURi2dqjxMjNs71o8MLbKQ3HE2B58Fl18bLXX3vrsJy9FWQLZzm+Xq4+sJmzm2oagSxCLpUJYgljsQNrStoqk83bMtqFtals63Dng2Q6MLS3L0EvAF1txNjFty1kwbcfa0bADawvDatZm2CqWTgsx2Yq3CbYNb1Nst7w9X9DJdoIdkd0ItkB2EGyJrBbsNbICPW/G2SrJ5outJXv1NFtJNllsI9n0abZ9SQtofb9I3/pPd7Wv0v4Gki3y31ZD0i8AAAAASUVORK5CYII='
 
 
 class InterpolPerson:
@@ -38,35 +94,64 @@ class InterpolPerson:
     Attributes:
     person_url (str): The URL where the data about the criminal is located.
     personal_info_data (dict): A dictionary to hold the processed data.
+    summary (dict): An optional notice dict from the listing response; when it
+        already carries every field needed, the detail request is skipped.
     """
 
-    def __init__(self, person_url):
+    # Every field read from the notice payload below; the prefetched summary
+    # can only replace the detail request when it carries all of them
+    _NOTICE_KEYS = (
+        'entity_id', 'name', 'forename', 'sex_id', 'country_of_birth_id',
+        'place_of_birth', 'date_of_birth', 'height', 'eyes_colors_id',
+        'hairs_id', 'distinguishing_marks', 'weight', 'nationalities',
+        'languages_spoken_ids', 'arrest_warrants', '_links'
+    )
+
+    def __init__(self, person_url, summary=None):
         # Initialize instance variables
         self.person_url = person_url
         self.personal_info_data = {}
+        self.summary = summary
+        # (headers, bytes) pairs for the raw pictures published on the binary
+        # images queue instead of travelling base64-encoded inside the JSON
+        self.image_payloads = []
 
     def _get_data(self):
         """
         This method processes and parses the data from the request,
         and adds it appropriately to the personal_info_data dictionary.
         """
-        # Get data from the provided URL
-        response = self.perform_request(self.person_url)
-        data = response.json()
+        # Use the notice embedded in the listing response when it already has
+        # every field; otherwise get the full data from the provided URL,
+        # revalidating against the copy cached from an earlier cycle
+        response_etag = None
+        if self.summary is not None and all(key in self.summary for key in self._NOTICE_KEYS):
+            data = self.summary
+        else:
+            cached = _PERSON_CACHE.get(self.person_url)
+            headers = {'If-None-Match': cached[0]} if cached is not None else None
+            response = self.perform_request(self.person_url, headers=headers)
+            if response.status_code == 304:
+                # Nothing changed upstream; the previously built payload
+                # (including its encoded pictures) is still valid
+                self.personal_info_data = cached[1]
+                return
+            data = orjson.loads(response.content)
+            response_etag = response.headers.get('ETag')
+
+        # Bind the entity id once; it feeds every dict built below
+        entity_id = data['entity_id']
 
         # Get the person's image URL, retrieve the image and encode it to base64
-        if "thumbnail" in data['_links'].keys():
-            image_url = data['_links']['thumbnail']['href']
-            image_response = self.perform_request(image_url)
-            image_content = image_response.content
-            image_base64 = base64.b64encode(image_content).decode("utf-8")
+        if "thumbnail" in data['_links']:
+            image_base64 = self._fetch_image_base64(data['_links']['thumbnail']['href'])
         else:
             # If there is no "thumbnail" information, a default image is assigned to the image_base64 value.
-            image_base64 = 'iVBORw0KGgoAAAANSUhEUgAAAKoAAACqAgMAAABAGDwRAAAADFBMVEWutLfk5ufb3d/EyMpaqx/2AAACUUlEQVRYw+3YK3LcQBAA0LZUBgJKkI8gHiLgoD3CAu1IVREQ3wU6gi6xPNQh2QMEzA2CdASDsFCTOJWsVur5dPeM7VTsKgm/mur5dfcIdsHfFla72tWudrVv0359/BFqTwDwEGYP8Oe7D7FK/7XvQux5WM/AHqsnm8u2mSikR9H2FwuFaPVsc8nWM4VUsu1iYRRsj2wpWI1sxluFKCS8rbBNeYunZk/Otp1hC9ZuDFuyVhs2Y61B4YqztWkTzlamTTnbmBaOjG0tOzJ2a9kbxnaWLRjbR9iNZcsIe83Y4Rk2Y6y2bP4fLLyxcV+jzV7oPMScs5iz3j/DFhH3+CYiP4wReecYnvsgIqeyeVJF5GrrQOSsHSLqRR9Rhzp6Kxzb0Mvr2DqiHu/oZXDtQJ10j+3I0u3ahpyaaxXZlnj6s4EK12MPVMvlsTXVyvn61NNkbwNsS7Sp3h785B/Wa/f+Yf3vgL2G98fQ94W6+xfvlv3jB/j+KyRe9W1aswfRqp/zHn8ULKLOEtv2ZNzN+114nkyZPKki6ttnu3YbURi2dqjxMjNs71o8MLbKQ3HE2B58Fl18bLXX3vrsJy9FWQLZzm+Xq4+sJmzm2oagSxCLpUJYgljsQNrStoqk83bMtqFtals63Dng2Q6MLS3L0EvAF1txNjFty1kwbcfa0bADawvDatZm2CqWTgsx2Yq3CbYNb1Nst7w9X9DJdoIdkd0ItkB2EGyJrBbsNbICPW/G2SrJ5outJXv1NFtJNllsI9n0abZ9SQtofb9I3/pPd7Wv0v4Gki3y31ZD0i8AAAAASUVORK5CYII='
+            image_base64 = DEFAULT_THUMBNAIL_B64
 
         # Save the personal information data in a dictionary
         self.personal_info_data = {
-            'entity_id': data['entity_id'],
+            'entity_id': entity_id,
             'name': data['name'],
             'forename': data['forename'],
             'sex_id': data['sex_id'],
@@ -74,90 +159,163 @@ class InterpolPerson:
             'place_of_birth': data['place_of_birth'],
             'date_of_birth': data['date_of_birth'],
             'height': data['height'],
-            'eyes_colors_id': None if data['eyes_colors_id'] == None else data['eyes_colors_id'][0],
-            'hairs_id': None if data['hairs_id'] == None else data['hairs_id'][0],
+            'eyes_colors_id': None if data['eyes_colors_id'] is None else data['eyes_colors_id'][0],
+            'hairs_id': None if data['hairs_id'] is None else data['hairs_id'][0],
             'distinguishing_marks': data['distinguishing_marks'],
             'weight': data['weight'],
             'is_active': True,
             'thumbnail': image_base64
         }
 
-        # Add nationality information to the personal information data
-        nationalities = []
-        if data['nationalities'] is None:
-            self.personal_info_data.update({'nationalities': None})
-        else:
-            for l in data['nationalities']:
-                nationalities.append({
-                    'entity_id': data['entity_id'],
-                    'nationality': l
-                })
-            self.personal_info_data.update({'nationalities': nationalities})
-
-        # Add languages spoken information to the personal information data
-        languages_spoken_ids = []
-        if data['languages_spoken_ids'] is None:
-            self.personal_info_data.update({'languages_spoken_ids': None})
-        else:
-            for l in data['languages_spoken_ids']:
-                languages_spoken_ids.append({
-                    'entity_id': data['entity_id'],
-                    'languages_spoken_id': l
-                })
-            self.personal_info_data.update({'languages_spoken_ids': languages_spoken_ids})
+        # Add nationality and language information to the personal information
+        # data; both expand the same way, so one helper builds them in one pass
+        self.personal_info_data['nationalities'] = self._expand(
+            entity_id, data['nationalities'], 'nationality')
+        self.personal_info_data['languages_spoken_ids'] = self._expand(
+            entity_id, data['languages_spoken_ids'], 'languages_spoken_id')
 
         # Add arrest warrants information to the personal information data
-        arrest_warrants = []
         if data['arrest_warrants'] is None:
-            self.personal_info_data.update({'arrest_warrants': None})
+            self.personal_info_data['arrest_warrants'] = None
         else:
-            for a in data['arrest_warrants']:
-                a.update({'entity_id': data['entity_id']})
-                arrest_warrants.append(a)
-            self.personal_info_data.update({'arrest_warrants': arrest_warrants})
-
-        # Add pictures information to the personal information data
-        pictures = []
-        pictures_link = self.perform_request(data['_links']['images']['href']).json()["_embedded"]['images']
+            self.personal_info_data['arrest_warrants'] = [
+                {**a, 'entity_id': entity_id} for a in data['arrest_warrants']]
+
+        # Add pictures information to the personal information data; the
+        # images are downloaded concurrently on the image pool
+        pictures_link = self._get_json(data['_links']['images']['href'])["_embedded"]['images']
         if pictures_link is None:
             self.personal_info_data.update({'pictures': None})
         else:
-            for p in pictures_link:
-                url = p['_links']['self']['href']
-                response = self.perform_request(url)
-                image_content = response.content
-                image_base64 = base64.b64encode(image_content).decode("utf-8")
-                picture_data = {
-                    'entity_id': data['entity_id'],
-                    'picture_id': p['picture_id'],
-                    'picture_url': p['_links']['self']['href'],
-                    'picture_base64': image_base64
-                }
-                pictures.append(picture_data)
+            pictures = list(IMAGE_POOL.map(lambda p: self._fetch_picture(entity_id, p), pictures_link))
             self.personal_info_data.update({'pictures': pictures})
 
+        # Remember the built payload under its ETag so the next cycle can
+        # revalidate instead of rebuilding
+        if response_etag:
+            _PERSON_CACHE[self.person_url] = (response_etag, self.personal_info_data)
+
     @staticmethod
-    def perform_request(url, params=None):
+    def _expand(entity_id, values, key):
+        """
+        Expands a list of plain values into the per-row dicts carried by the
+        outgoing message, or passes None through.
+
+        Args:
+            entity_id (str): The entity ID the values belong to.
+            values (list or None): The raw values from the notice payload.
+            key (str): The field name each value is stored under.
+
+        Returns:
+            list of dict or None: The expanded rows, or None if values is None.
+        """
+        if values is None:
+            return None
+        return [{'entity_id': entity_id, key: value} for value in values]
+
+    def _fetch_picture(self, entity_id, picture):
+        """
+        Downloads a single picture, queues its raw bytes for the binary images
+        queue, and returns the picture's metadata dictionary.
+
+        Args:
+            entity_id (str): The entity ID the picture belongs to.
+            picture (dict): The picture entry from the images collection.
+
+        Returns:
+            dict: The picture metadata; the image content itself travels on
+            the images queue rather than base64-encoded inside the JSON.
+        """
+        url = picture['_links']['self']['href']
+        picture_id = picture['picture_id']
+        self.image_payloads.append((
+            {'entity_id': entity_id, 'picture_id': picture_id, 'picture_url': url},
+            self._fetch_image_bytes(url)
+        ))
+        return {
+            'entity_id': entity_id,
+            'picture_id': picture_id,
+            'picture_url': url,
+            'picture_base64': None
+        }
+
+    def _fetch_image_bytes(self, url):
+        """
+        Returns the raw content of the image at the given URL, downloading it
+        only on the first request for that URL.
+
+        Args:
+            url (str): The URL of the image.
+
+        Returns:
+            bytes: The raw image content.
+        """
+        content = _IMAGE_BYTES_CACHE.get(url)
+        if content is None:
+            content = self.perform_request(url).content
+            _IMAGE_BYTES_CACHE[url] = content
+        return content
+
+    def _fetch_image_base64(self, url):
+        """
+        Returns the base64-encoded content of the image at the given URL,
+        downloading and encoding it only on the first request for that URL.
+
+        Args:
+            url (str): The URL of the image.
+
+        Returns:
+            str: The base64-encoded image content.
+        """
+        image_base64 = _IMAGE_CACHE.get(url)
+        if image_base64 is None:
+            response = self.perform_request(url)
+            # base64 output is pure ASCII, so the ascii codec's fast path
+            # skips UTF-8 validation over the whole blob
+            image_base64 = base64.b64encode(response.content).decode("ascii")
+            _IMAGE_CACHE[url] = image_base64
+        return image_base64
+
+    @staticmethod
+    def _get_json(url):
+        """
+        Fetches and parses a JSON endpoint, caching the parsed payload by URL
+        for the duration of the current retrieval cycle.
+
+        Args:
+            url (str): The URL to fetch.
+
+        Returns:
+            dict: The parsed JSON payload.
+        """
+        parsed = _JSON_CACHE.get(url)
+        if parsed is None:
+            response = InterpolPerson.perform_request(url)
+            # orjson parses the response bytes directly, well faster than the
+            # stdlib decoder behind response.json()
+            parsed = orjson.loads(response.content)
+            _JSON_CACHE[url] = parsed
+        return parsed
+
+    @staticmethod
+    def perform_request(url, params=None, headers=None):
         """
         Perform an HTTP GET request.
 
         Args:
             url (str): The URL to make the request.
             params (dict, optional): Dictionary or bytes to be sent in the query string for the Request.
+            headers (dict, optional): Extra headers to send with the request.
 
         Returns:
             requests.Response: The response object.
 
         Raises:
-            requests.exceptions.RequestException: If an error occurs during the request.
+            requests.exceptions.RequestException: If the request still fails after the adapter's retries.
         """
-        while True:
-            try:
-                response = requests.get(url, headers={}, params=params)
-                return response
-            except requests.exceptions.RequestException:
-                print("Internet connection lost. Trying to reconnect...")
-                time.sleep(5)
+        # The session's adapter retries transient errors with backoff; the
+        # explicit timeout keeps a stalled connect or read from hanging forever
+        return SESSION.get(url, headers=headers, params=params, timeout=(5, 30))
 
     def get_personal_info_data(self):
         """
@@ -177,16 +335,18 @@ class InterpolDataRetriever:
     """
 
     def __init__(self, nationality):
-        # Create the engine
-        self.engine = create_engine(db_url)
-        self.DBSession = sessionmaker(bind=engine)
-        self.session = self.DBSession()
+        # Draw a session from the module-level pooled engine
+        self.session = DBSession()
         self.nationality = nationality
 
     def retrieve_data(self):
         """
         Retrieve data from Interpol, process it, and perform database operations.
         """
+        # One clock read per cycle so every change logged in this pass shares
+        # the same timestamp, which keeps the audit trail groupable by cycle
+        cycle_timestamp = datetime.datetime.now()
+
         # Define the URL for the Interpol Red Notices endpoint
         url = "https://ws-public.interpol.int/notices/v1/red"
 
@@ -197,71 +357,95 @@ class InterpolDataRetriever:
             "page": 1  # Request the first page of results
         }
 
+        # The JSON cache only holds for one cycle; anything cached by the
+        # previous pass may be stale by now
+        _JSON_CACHE.clear()
+
         # Perform the GET request and get the response
         response = InterpolPerson.perform_request(url, params)
 
         # Convert the response to JSON format
-        json_list = response.json()
-
-        # Initialize a list to hold the entity IDs of the persons
-        entity_id_list = []
+        json_list = orjson.loads(response.content)
 
         # Get the list of persons from the response
         persons_list = json_list['_embedded']['notices']
 
-        # Process each person in the list
-        for person in persons_list:
-            # Get the person's self link
-            person_links = person['_links']['self']['href']
-
-            # Create an InterpolPerson object for the person
-            interpol_person = InterpolPerson(person_links)
-
-            # Get the person's personal info data
-            personal_info_data = interpol_person.get_personal_info_data()
-
+        # Fetch every person concurrently on the worker pool; the database and
+        # queue work below stays on this thread, so the session is never shared
+        futures = [PERSON_POOL.submit(self._fetch_person, person) for person in persons_list]
+
+        # Collect the fetched persons, then answer all of the existence checks
+        # with one IN query instead of one SELECT per person
+        results = [future.result() for future in futures]
+        entity_id_list = [personal_info_data['entity_id'] for personal_info_data, _ in results]
+        existing_ids = {row[0] for row in self.session.query(AppPersonalInformation.entity_id).filter(
+            AppPersonalInformation.entity_id.in_(entity_id_list)).all()}
+
+        # One producer per queue for the whole cycle; opening a fresh AMQP
+        # connection per message cost a TCP and protocol handshake each time
+        add_producer = Producer('add_data')
+        change_producer = Producer('change_data')
+
+        # Sort each person's message into its queue's batch; the batches are
+        # published inside AMQP transactions below instead of one frame
+        # round-trip per message
+        add_bodies = []
+        change_bodies = []
+        image_messages = []
+        for personal_info_data, image_payloads in results:
+            image_messages.extend(image_payloads)
             # Get the person's entity ID
             entity_id = personal_info_data['entity_id']
 
-            # Add the entity ID to the list
-            entity_id_list.append(entity_id)
             # Check if the person is already in the database
-            if self.session.query(AppPersonalInformation).filter_by(entity_id=entity_id).first():
-                json_data = json.dumps(personal_info_data)
-                producer = Producer('change_data')
-                producer.publish(json_data)
-                producer.close()
+            if entity_id in existing_ids:
+                # orjson serializes straight to bytes, which basic_publish
+                # takes as the body without another copy
+                change_bodies.append(orjson.dumps(personal_info_data))
                 print(f"The data with {entity_id} entity_id already exists in the database.")
             else:
                 # Add the person to the database and publish their personal information
-                json_data = json.dumps(personal_info_data)
-                producer = Producer('add_data')
-                producer.publish(json_data)
-                producer.close()
+                add_bodies.append(orjson.dumps(personal_info_data))
                 print(f"The data with {entity_id} entity_id has been added to the database.")
 
-        # Get the existing entity IDs from the database
-        existing_entity_ids = self.session.query(AppPersonalInformation.entity_id).all()
-        existing_entity_ids = [entity_id[0] for entity_id in existing_entity_ids]
-
-        # Update the is_active value for records with missing entity IDs
-        for entity_id in existing_entity_ids:
-            if entity_id not in entity_id_list:
-                person = self.session.query(AppPersonalInformation).filter_by(entity_id=entity_id).first()
-                # If the "is_active" property of the person not in the database is "True", set it to "False".
-                if person.is_active == True:
-                    person.is_active = False
-                    change_log_entry = AppChangeAppLogInformation(
-                        entity_id=entity_id,
-                        table_name="personal_informations",
-                        field_name="is_active",
-                        old_value=True,
-                        new_value=False,
-                        description="Change in personal information",
-                        change_date=datetime.datetime.now()
-                    )
-                    # Add the ChangeLogInformation object to the session to be committed to the database
-                    self.session.add(change_log_entry)
+        add_producer.publish_many(add_bodies)
+        change_producer.publish_many(change_bodies)
+        add_producer.close()
+        change_producer.close()
+
+        # Ship the raw picture bytes on their own queue; the consumer encodes
+        # and attaches them to the picture rows referenced by the metadata
+        if image_messages:
+            images_producer = Producer('images')
+            images_producer.publish_images(image_messages)
+            images_producer.close()
+
+        # Deactivate records whose entity IDs vanished from the feed with one
+        # UPDATE; RETURNING reports which rows actually flipped, so the change
+        # log and counter can be written in one statement each
+        stale_ids = self.session.execute(
+            update(AppPersonalInformation)
+            .where(AppPersonalInformation.is_active == True,
+                   ~AppPersonalInformation.entity_id.in_(entity_id_list))
+            .values(is_active=False)
+            .returning(AppPersonalInformation.entity_id)
+        ).scalars().all()
+        if stale_ids:
+            self.session.bulk_insert_mappings(AppChangeAppLogInformation, [
+                {
+                    'entity_id': entity_id,
+                    'table_name': 'personal_informations',
+                    'field_name': 'is_active',
+                    'old_value': 'True',
+                    'new_value': 'False',
+                    'description': 'Change in personal information',
+                    'change_date': cycle_timestamp
+                }
+                for entity_id in stale_ids
+            ])
+            # Keep the running 'changed' counter in step with the change log
+            self.session.query(AppCounterInformation).filter_by(name='changed').update(
+                {AppCounterInformation.value: AppCounterInformation.value + len(stale_ids)})
 
         # Commit the changes
         try:
@@ -269,6 +453,24 @@ class InterpolDataRetriever:
         except IntegrityError:
             # If there is an integrity error during commit, rollback the transaction
             self.session.rollback()
+        finally:
+            # Return the connection to the shared pool for the next cycle
+            self.session.close()
+
+    @staticmethod
+    def _fetch_person(person):
+        """
+        Builds one person's outgoing payload on a worker thread.
+
+        Args:
+            person (dict): The notice dict embedded in the listing response.
+
+        Returns:
+            tuple: The personal info data and the person's raw image payloads.
+        """
+        interpol_person = InterpolPerson(person['_links']['self']['href'], summary=person)
+        personal_info_data = interpol_person.get_personal_info_data()
+        return personal_info_data, interpol_person.image_payloads
 
 
 class Producer:
@@ -286,16 +488,60 @@ class Producer:
         self.key = key
         self.connection = pika.BlockingConnection(pika.ConnectionParameters(host=rabbitmq_host))
         self.channel = self.connection.channel()
-        self.channel.queue_declare(queue=self.key)
+        self.channel.queue_declare(queue=self.key, durable=True)
 
     def publish(self, message):
         """
         Publish a message to the RabbitMQ queue.
 
         Args:
-            message (str): The message to be published.
+            message (bytes): The serialized message body to be published.
+        """
+        # Mark the message persistent so the durable queue can page it to disk;
+        # the JSON body is compressed to cut broker memory and network bytes
+        self.channel.basic_publish(
+            exchange='', routing_key=self.key, body=_COMPRESSOR.compress(message),
+            properties=pika.BasicProperties(delivery_mode=2, content_encoding='zstd'))
+
+    def publish_many(self, messages, batch_size=100):
         """
-        self.channel.basic_publish(exchange='', routing_key=self.key, body=message)
+        Publish a batch of messages inside AMQP transactions, committing every
+        batch_size messages so the broker flushes once per batch instead of
+        once per publish.
+
+        Args:
+            messages (list of bytes): The serialized message bodies to publish.
+            batch_size (int): How many messages to publish per transaction.
+        """
+        if not messages:
+            return
+        self.channel.tx_select()
+        for start in range(0, len(messages), batch_size):
+            for message in messages[start:start + batch_size]:
+                self.channel.basic_publish(
+                    exchange='', routing_key=self.key, body=_COMPRESSOR.compress(message),
+                    properties=pika.BasicProperties(delivery_mode=2, content_encoding='zstd'))
+            self.channel.tx_commit()
+
+    def publish_images(self, images, batch_size=100):
+        """
+        Publish raw image messages inside AMQP transactions, carrying the
+        picture metadata in the message headers.
+
+        Args:
+            images (list of tuple): (headers, bytes) pairs to publish.
+            batch_size (int): How many messages to publish per transaction.
+        """
+        if not images:
+            return
+        self.channel.tx_select()
+        for start in range(0, len(images), batch_size):
+            for headers, content in images[start:start + batch_size]:
+                self.channel.basic_publish(
+                    exchange='', routing_key=self.key, body=content,
+                    properties=pika.BasicProperties(
+                        delivery_mode=2, content_type='image/jpeg', headers=headers))
+            self.channel.tx_commit()
 
     def close(self):
         """
@@ -316,5 +562,10 @@ if __name__ == "__main__":
         data_retriever = InterpolDataRetriever("US")
 
         # Call the retrieve_data method of the InterpolDataRetriever instance to retrieve data from Interpol,
-        # process it, and perform database operations.
-        data_retriever.retrieve_data()
+        # process it, and perform database operations. An outage that outlives
+        # the session's bounded retries must not kill the crawler loop; skip
+        # the cycle and try again on the next one.
+        try:
+            data_retriever.retrieve_data()
+        except requests.exceptions.RequestException as error:
+            print(f"Skipping this crawl cycle, Interpol request failed: {error}")
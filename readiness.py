@@ -0,0 +1,28 @@
+import socket
+import time
+
+
+def wait_for(host, port, timeout=30):
+    """
+    Blocks until a TCP connection to the given host and port succeeds, using
+    exponential backoff between attempts instead of a fixed startup sleep.
+
+    Args:
+        host (str): The host to connect to.
+        port (int): The port to connect to.
+        timeout (int, optional): Total seconds to keep trying before giving up.
+
+    Raises:
+        TimeoutError: If the service is still unreachable after the timeout.
+    """
+    deadline = time.monotonic() + timeout
+    attempt = 0
+    while True:
+        try:
+            with socket.create_connection((host, int(port)), timeout=1):
+                return
+        except OSError:
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"{host}:{port} did not become ready within {timeout} seconds")
+            time.sleep(min(0.1 * 2 ** attempt, 2))
+            attempt += 1